@@ -31,6 +31,7 @@ class Settings(BaseSettings):
     secret_key: str = "CHANGE-ME-IN-PRODUCTION"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 1440  # 24 hours
+    bcrypt_rounds: int = 12       # password hashing cost (tests lower it to 4, bcrypt's minimum)
 
     # CORS (for Vue.js dev server)
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -1046,6 +1046,28 @@ async def _migrate_add_project_archived(conn):
     _log.info("Migration v23_project_archived complete")
 
 
+async def _migrate_add_project_user_index(conn):
+    """v24: Index projects.user_id (project lists, dashboard and admin counts)."""
+    try:
+        r = await conn.execute(
+            text("SELECT 1 FROM schema_versions WHERE version = 'v24_project_user_index'")
+        )
+        if r.scalar():
+            return
+    except Exception:
+        pass
+
+    _log.info("Migration v24: projects.user_id index — starting")
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_projects_user_id ON projects (user_id)"
+    ))
+    await conn.execute(text(
+        "INSERT INTO schema_versions (version, applied_at) "
+        "VALUES ('v24_project_user_index', CURRENT_TIMESTAMP) ON CONFLICT DO NOTHING"
+    ))
+    _log.info("Migration v24_project_user_index complete")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup/shutdown events."""
@@ -1098,6 +1120,8 @@ async def lifespan(app: FastAPI):
         await _migrate_add_scitq_task_id(conn)
     async with engine.begin() as conn:
         await _migrate_add_project_archived(conn)
+    async with engine.begin() as conn:
+        await _migrate_add_project_user_index(conn)
     _log.info("PredomicsApp started — data_dir=%s", settings.data_dir)
     yield
 
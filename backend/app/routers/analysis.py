@@ -6,6 +6,7 @@ import hashlib
 import itertools
 import json
 import logging
+import os
 import re
 import time
 import uuid
@@ -1132,10 +1133,17 @@ def _job_disk_size(project_id: str, job_id: str) -> int | None:
     job_dir = Path(storage.settings.project_dir) / project_id / "jobs" / job_id
     if not job_dir.is_dir():
         return None
+    # os.scandir reuses the stat data from the directory listing, so each
+    # entry costs one syscall instead of the two done by rglob + stat().
     total = 0
-    for f in job_dir.rglob("*"):
-        if f.is_file():
-            total += f.stat().st_size
+    stack = [str(job_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
     return total
 
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 import logging
 import time
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -45,9 +46,10 @@ except ImportError:
     HAS_ENGINE = False
     logger.warning("gpredomicspy not installed — data analysis will use mock mode")
 
-# Simple TTL cache: (x_path, y_path, method, prevalence, pvalue) -> (timestamp, result)
-_cache: dict[tuple, tuple[float, dict]] = {}
+# Bounded TTL + LRU cache: (x_path, y_path, method, prevalence, pvalue) -> (timestamp, result)
+_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
 _CACHE_TTL = 300  # 5 minutes
+_CACHE_MAX = 32
 
 
 def _cache_key(x_path: str, y_path: str, method: str, prevalence_pct: float, max_pvalue: float) -> tuple:
@@ -55,22 +57,23 @@ def _cache_key(x_path: str, y_path: str, method: str, prevalence_pct: float, max
 
 
 def _get_cached(key: tuple) -> dict | None:
-    if key in _cache:
-        ts, result = _cache[key]
-        if time.time() - ts < _CACHE_TTL:
-            return result
-        del _cache[key]
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    ts, result = entry
+    if time.time() - ts < _CACHE_TTL:
+        _cache.move_to_end(key)
+        return result
+    _cache.pop(key, None)
     return None
 
 
 def _set_cached(key: tuple, result: dict) -> None:
     _cache[key] = (time.time(), result)
-    # Evict old entries if cache grows too large
-    if len(_cache) > 20:
-        now = time.time()
-        expired = [k for k, (ts, _) in _cache.items() if now - ts > _CACHE_TTL]
-        for k in expired:
-            del _cache[k]
+    _cache.move_to_end(key)
+    # Evict least recently used entries beyond the size limit
+    while len(_cache) > _CACHE_MAX:
+        _cache.popitem(last=False)
 
 
 def run_filtering(
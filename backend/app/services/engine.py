@@ -11,6 +11,11 @@ import numpy as np
 import pandas as pd
 import yaml
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+
 from ..core.config import settings as app_settings
 from ..models.schemas import REGRESSION_FIT_FUNCTIONS
 
@@ -247,7 +252,7 @@ def write_param_yaml(
 
     yaml_path = Path(output_dir) / "param.yaml"
     with open(yaml_path, "w") as f:
-        yaml.dump(param, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(param, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
 
     return str(yaml_path)
 
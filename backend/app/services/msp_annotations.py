@@ -7,6 +7,7 @@ Uses concurrent requests for fast bulk fetching.
 from __future__ import annotations
 import json
 import logging
+import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
@@ -17,33 +18,16 @@ from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional — it parses/serialises the annotation cache several
+# times faster than the stdlib, and writes the same JSON format
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 BIOBANKS_API = "https://biobanks.gmt.bio/msp/"
 CACHE_FILE = Path(settings.data_dir) / "cache" / "msp_annotations.json"
-
-# In-memory cache (loaded from disk on first access)
-_cache: dict[str, dict[str, Any]] | None = None
-
-
-def _load_cache() -> dict[str, dict[str, Any]]:
-    global _cache
-    if _cache is not None:
-        return _cache
-    if CACHE_FILE.exists():
-        try:
-            _cache = json.loads(CACHE_FILE.read_text())
-            logger.info("Loaded %d MSP annotations from cache", len(_cache))
-        except Exception:
-            _cache = {}
-    else:
-        _cache = {}
-    return _cache
-
-
-def _save_cache():
-    if _cache is None:
-        return
-    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    CACHE_FILE.write_text(json.dumps(_cache, indent=1))
+_MSP_PREFIX_RE = re.compile(r"msp_", re.IGNORECASE)
 
 
 def _fetch_single(msp_id: str) -> tuple[str, dict[str, Any] | None]:
@@ -59,44 +43,77 @@ def _fetch_single(msp_id: str) -> tuple[str, dict[str, Any] | None]:
     return msp_id, None
 
 
-def get_annotations(feature_names: list[str]) -> dict[str, dict[str, Any]]:
-    """Look up MSP annotations for a list of feature names.
+class MspAnnotationsCache:
+    """MSP annotations backed by a JSON file, loaded into memory on first access."""
 
-    Only queries features that look like MSP identifiers (msp_NNNN pattern).
-    Uses concurrent requests (max 20 threads) for fast bulk fetching.
-    Returns a dict mapping feature name -> annotation dict.
-    """
-    cache = _load_cache()
-    result = {}
-    to_fetch = []
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self._cache: dict[str, dict[str, Any]] | None = None
 
-    for name in feature_names:
-        if not name.lower().startswith("msp_"):
-            continue
-        if name in cache:
-            result[name] = cache[name]
+    def load(self) -> dict[str, dict[str, Any]]:
+        if self._cache is not None:
+            return self._cache
+        if self.cache_file.exists():
+            try:
+                raw = self.cache_file.read_bytes()
+                self._cache = orjson.loads(raw) if orjson else json.loads(raw)
+                logger.info("Loaded %d MSP annotations from cache", len(self._cache))
+            except Exception:
+                self._cache = {}
+        else:
+            self._cache = {}
+        return self._cache
+
+    def save(self):
+        if self._cache is None:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        if orjson:
+            self.cache_file.write_bytes(orjson.dumps(self._cache))
         else:
-            to_fetch.append(name)
-
-    if to_fetch:
-        logger.info("Fetching %d MSP annotations from biobanks.gmt.bio", len(to_fetch))
-        max_workers = min(20, len(to_fetch))
-        fetched = 0
-        failed = 0
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(_fetch_single, msp_id): msp_id for msp_id in to_fetch}
-            for future in as_completed(futures):
-                msp_id, data = future.result()
-                if data:
-                    cache[msp_id] = data
-                    result[msp_id] = data
-                    fetched += 1
-                else:
-                    # Cache empty so we don't re-fetch
-                    cache[msp_id] = {}
-                    failed += 1
-        logger.info("MSP fetch complete: %d succeeded, %d failed", fetched, failed)
-        _save_cache()
-
-    # Filter out empty entries (failed lookups)
-    return {k: v for k, v in result.items() if v}
+            self.cache_file.write_text(json.dumps(self._cache, separators=(",", ":")))
+
+    def get_annotations(self, feature_names: list[str]) -> dict[str, dict[str, Any]]:
+        """Look up MSP annotations for a list of feature names.
+
+        Only queries features that look like MSP identifiers (msp_NNNN pattern).
+        Uses concurrent requests (max 20 threads) for fast bulk fetching.
+        Returns a dict mapping feature name -> annotation dict.
+        """
+        if not feature_names:
+            return {}
+        cache = self.load()
+        # The cache only ever holds MSP ids, so a plain membership test
+        # replaces the per-name prefix check for cache hits
+        result = {name: cache[name] for name in feature_names if name in cache}
+        to_fetch = [
+            name for name in dict.fromkeys(feature_names)
+            if name not in cache and _MSP_PREFIX_RE.match(name)
+        ]
+
+        if to_fetch:
+            logger.info("Fetching %d MSP annotations from biobanks.gmt.bio", len(to_fetch))
+            max_workers = min(20, len(to_fetch))
+            fetched = 0
+            failed = 0
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(_fetch_single, msp_id): msp_id for msp_id in to_fetch}
+                for future in as_completed(futures):
+                    msp_id, data = future.result()
+                    if data:
+                        cache[msp_id] = data
+                        result[msp_id] = data
+                        fetched += 1
+                    else:
+                        # Cache empty so we don't re-fetch
+                        cache[msp_id] = {}
+                        failed += 1
+            logger.info("MSP fetch complete: %d succeeded, %d failed", fetched, failed)
+            self.save()
+
+        # Filter out empty entries (failed lookups)
+        return {k: v for k, v in result.items() if v}
+
+
+default = MspAnnotationsCache(CACHE_FILE)
+get_annotations = default.get_annotations
@@ -8,6 +8,11 @@ import numpy as np
 import pandas as pd
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 def _compute_auc(y_true, scores):
     """Compute AUC using the trapezoidal rule (no sklearn dependency)."""
@@ -100,7 +105,7 @@ def _prepare_test_context(experiment, param_path):
     Returns a context dict with pre-loaded arrays, or None if no test data.
     """
     with open(param_path) as f:
-        param_cfg = yaml.safe_load(f)
+        param_cfg = yaml.load(f, Loader=_YamlLoader)
 
     data_cfg = param_cfg.get("data", {})
     xtest_path = data_cfg.get("Xtest", "")
@@ -173,9 +178,45 @@ def _evaluate_one_generation(gen_best, ctx):
         return None
 
 
+# Compiled once: every display/log parser strips colour codes first.
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+
 def _strip_ansi(text):
     """Remove ANSI escape codes from text."""
-    return re.sub(r'\x1b\[[0-9;]*m', '', text)
+    return _ANSI_RE.sub('', text)
+
+
+# Jury section patterns, compiled once: the parser runs on every job's
+# display output.
+# "Majority jury [133 experts] | AUC 1.000/0.760 | accuracy ..."
+_JURY_RE = re.compile(
+    r'(Majority|Consensus)\s+jury\s+\[(\d+)\s+experts?\]\s*\|'
+    r'\s*AUC\s+([\d.]+)/([\d.]+)\s*\|'
+    r'\s*accuracy\s+([\d.]+)/([\d.]+)\s*\|'
+    r'\s*sensitivity\s+([\d.]+)/([\d.]+)\s*\|'
+    r'\s*specificity\s+([\d.]+)/([\d.]+)\s*\|'
+    r'\s*rejection rate\s+([\d.]+)/([\d.]+)'
+)
+_CONFUSION_RES = {
+    key: re.compile(
+        rf'CONFUSION MATRIX \({label}\).*?'
+        r'Real 1\s*\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\d+).*?'
+        r'Real 0\s*\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\d+)',
+        re.DOTALL,
+    )
+    for label, key in [("TRAIN", "confusion_train"), ("TEST", "confusion_test")]
+}
+_FBM_RE = re.compile(
+    r'FBM mean \(n=(\d+)\)\s*-\s*AUC\s+([\d.]+)/([\d.]+)\s*\|'
+    r'\s*accuracy\s+([\d.]+)/([\d.]+)\s*\|'
+    r'\s*sensitivity\s+([\d.]+)/([\d.]+)\s*\|'
+    r'\s*specificity\s+([\d.]+)/([\d.]+)'
+)
+_SAMPLE_ROW_RE = re.compile(
+    r'^\s*(\S+)\s*\|\s*(\d)\s*\|\s*([012]+)\s*.*?→\s*(-?\d+)\s*\|\s*(✓|✗|~)\s*\|\s*([\d.]+)%',
+    re.MULTILINE,
+)
 
 
 def _parse_jury_from_display(display_text):
@@ -186,16 +227,7 @@ def _parse_jury_from_display(display_text):
     """
     text = _strip_ansi(display_text)
 
-    # Match: "Majority jury [133 experts] | AUC 1.000/0.760 | accuracy ..."
-    jury_match = re.search(
-        r'(Majority|Consensus)\s+jury\s+\[(\d+)\s+experts?\]\s*\|'
-        r'\s*AUC\s+([\d.]+)/([\d.]+)\s*\|'
-        r'\s*accuracy\s+([\d.]+)/([\d.]+)\s*\|'
-        r'\s*sensitivity\s+([\d.]+)/([\d.]+)\s*\|'
-        r'\s*specificity\s+([\d.]+)/([\d.]+)\s*\|'
-        r'\s*rejection rate\s+([\d.]+)/([\d.]+)',
-        text
-    )
+    jury_match = _JURY_RE.search(text)
     if not jury_match:
         return None
 
@@ -219,13 +251,8 @@ def _parse_jury_from_display(display_text):
     }
 
     # Parse confusion matrices
-    for label, key in [("TRAIN", "confusion_train"), ("TEST", "confusion_test")]:
-        cm_match = re.search(
-            rf'CONFUSION MATRIX \({label}\).*?'
-            r'Real 1\s*\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\d+).*?'
-            r'Real 0\s*\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\d+)',
-            text, re.DOTALL
-        )
+    for key, cm_re in _CONFUSION_RES.items():
+        cm_match = cm_re.search(text)
         if cm_match:
             jury[key] = {
                 "tp": int(cm_match.group(1)),
@@ -237,13 +264,7 @@ def _parse_jury_from_display(display_text):
             }
 
     # Parse FBM mean stats
-    fbm_match = re.search(
-        r'FBM mean \(n=(\d+)\)\s*-\s*AUC\s+([\d.]+)/([\d.]+)\s*\|'
-        r'\s*accuracy\s+([\d.]+)/([\d.]+)\s*\|'
-        r'\s*sensitivity\s+([\d.]+)/([\d.]+)\s*\|'
-        r'\s*specificity\s+([\d.]+)/([\d.]+)',
-        text
-    )
+    fbm_match = _FBM_RE.search(text)
     if fbm_match:
         jury["fbm"] = {
             "count": int(fbm_match.group(1)),
@@ -266,37 +287,41 @@ def _parse_jury_from_display(display_text):
     # Rejected samples use ~ and predicted=2, votes may contain 2
     samples = []
     vote_strings = []
-    for m in re.finditer(
-        r'^\s*(\S+)\s*\|\s*(\d)\s*\|\s*([012]+)\s*.*?→\s*(-?\d+)\s*\|\s*(✓|✗|~)\s*\|\s*([\d.]+)%',
-        text, re.MULTILINE
-    ):
-        vote_str = m.group(3)
-        predicted = int(m.group(4))
-        result_sym = m.group(5)
-        correct = result_sym == "✓"
+    for m in _SAMPLE_ROW_RE.finditer(text):
+        name, real, vote_str, predicted, result_sym, consistency = m.groups()
         samples.append({
-            "name": m.group(1),
-            "real": int(m.group(2)),
+            "name": name,
+            "real": int(real),
             "votes": vote_str,
-            "predicted": predicted,
-            "correct": correct,
-            "consistency": float(m.group(6)),
+            "predicted": int(predicted),
+            "correct": result_sym == "✓",
+            "consistency": float(consistency),
         })
         vote_strings.append(vote_str)
     if samples:
         jury["sample_predictions"] = samples
         # Build vote matrix: rows=samples, columns=experts, values=0/1/2
         if vote_strings and all(len(v) == len(vote_strings[0]) for v in vote_strings):
+            n_experts = len(vote_strings[0])
+            # Decode every vote digit in one vectorised pass rather than int() per char
+            votes = np.frombuffer("".join(vote_strings).encode("ascii"), dtype=np.uint8) - ord("0")
             jury["vote_matrix"] = {
                 "sample_names": [s["name"] for s in samples],
                 "real_classes": [s["real"] for s in samples],
-                "votes": [[int(c) for c in v] for v in vote_strings],
-                "n_experts": len(vote_strings[0]),
+                "votes": votes.reshape(len(vote_strings), n_experts).tolist(),
+                "n_experts": n_experts,
             }
 
     return jury
 
 
+# Importance section header, e.g. "Feature importance (MDA, scaled, mean):",
+# followed by rows like "  msp_0069  0.0234  +".  Compiled once: the parser
+# runs on every job's display output.
+_IMPORTANCE_HEADER_RE = re.compile(r'(?:Feature importance|IMPORTANCE).*?\n', re.IGNORECASE)
+_IMPORTANCE_ROW_RE = re.compile(r'\s+(\S+)\s+([\d.e+-]+\S*)(?:[ \t]+(\S+))?.*\n', re.IGNORECASE)
+
+
 def _parse_importance_from_display(display_text):
     """Parse feature importance from display_results() output.
 
@@ -304,26 +329,25 @@ def _parse_importance_from_display(display_text):
     """
     text = _strip_ansi(display_text)
 
-    # Look for importance section — format varies, try common patterns
-    # Typical: "Feature importance (MDA, scaled, mean):"
-    # Then lines like: "  msp_0069  0.0234  +"
-    imp_section = re.search(r'(?:Feature importance|IMPORTANCE).*?\n((?:\s+\S+\s+[\d.e+-]+.*\n)+)', text, re.IGNORECASE)
-    if not imp_section:
-        return None
-
-    items = []
-    for line in imp_section.group(1).strip().split('\n'):
-        parts = line.split()
-        if len(parts) >= 2:
+    # Only the contiguous block of rows right after a header is scanned,
+    # instead of re-walking the whole output.
+    for header in _IMPORTANCE_HEADER_RE.finditer(text):
+        items = []
+        pos = header.end()
+        while (row := _IMPORTANCE_ROW_RE.match(text, pos)):
+            pos = row.end()
+            feature, importance, direction = row.groups()
             try:
                 items.append({
-                    "feature": parts[0],
-                    "importance": float(parts[1]),
-                    "direction": parts[2] if len(parts) > 2 else "",
+                    "feature": feature,
+                    "importance": float(importance),
+                    "direction": direction or "",
                 })
             except ValueError:
                 continue
-    return items if items else None
+        if pos != header.end():
+            return items if items else None
+    return None
 
 
 def _run_clinical_integration(experiment, param_yaml: dict, clinical_cfg: dict) -> dict:
@@ -434,7 +458,7 @@ def main():
 
     # Check if this is a sklearn algorithm
     with open(param_path) as _f:
-        _param_yaml = yaml.safe_load(_f)
+        _param_yaml = yaml.load(_f, Loader=_YamlLoader)
     algo = _param_yaml.get("general", {}).get("algo", "ga")
     fit_function = _param_yaml.get("general", {}).get("fit", "auc")
     is_regression = fit_function in REGRESSION_FITS
@@ -9,6 +9,10 @@ Putting the same env setup at the top of test_api.py is not reliable: pytest
 may collect test_services_unit.py first, which imports `app.services.*` and
 therefore `app.core.config.settings`, baking in the default paths before
 test_api.py's module-level code ever runs.
+
+Every process that imports this file gets its own mkdtemp() directory, and
+with it its own data dirs and SQLite file, so parallel runners such as
+pytest-xdist need no per-worker setup.
 """
 
 from __future__ import annotations
@@ -25,6 +29,9 @@ os.environ["PREDOMICS_SAMPLE_DIR"] = os.path.join(_tmp, "samples")  # legacy com
 os.environ["PREDOMICS_DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmp, 'test.db')}"
 os.environ["PREDOMICS_SECRET_KEY"] = "test-secret-key"
 os.environ["PREDOMICS_RATE_LIMIT_ENABLED"] = "false"
+# Minimum bcrypt cost: hashing is otherwise the slowest part of every
+# register / login / password-change request in the suite.
+os.environ["PREDOMICS_BCRYPT_ROUNDS"] = "4"
 
 # Expose the tmpdir for tests that want to write fixture files under it.
 os.environ["PREDOMICS_TEST_TMPDIR"] = _tmp
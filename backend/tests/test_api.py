@@ -1,5 +1,6 @@
 """Comprehensive API tests for PredomicsApp backend."""
 
+import asyncio
 import json
 import os
 import shutil
@@ -9,6 +10,7 @@ from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
+import yaml
 from httpx import AsyncClient, ASGITransport
 
 # Env overrides are set in conftest.py so they're in place before ANY test
@@ -18,29 +20,76 @@ _tmp = os.environ["PREDOMICS_TEST_TMPDIR"]
 _db_path = os.path.join(_tmp, "test.db")
 
 from app.main import app  # noqa: E402
-from app.core.database import engine, Base, get_db, async_session_factory, sync_engine  # noqa: E402
+from app.core.database import Base, get_db, async_session_factory, sync_engine  # noqa: E402
 from app.services import engine as ml_engine  # noqa: E402
 from app.services import storage  # noqa: E402
 from app.services import data_analysis  # noqa: E402
+from app.services.data_analysis import _cache_key, _get_cached, _set_cached  # noqa: E402
+from app.services.msp_annotations import MspAnnotationsCache, get_annotations  # noqa: E402
+from app.routers.export import (  # noqa: E402
+    _build_importance_html, _build_jury_html, _esc, _fmt, _nb_cell,
+)
+from app.services.worker import (  # noqa: E402
+    _parse_importance_from_display, _parse_jury_from_display, _strip_ansi,
+)
+
+# Built once: tests only read it or write it to disk
+MOCK_RESULTS = ml_engine._mock_results()
+
+
+@pytest.fixture(scope="session")
+def db_schema():
+    """Create the tables once for the whole test session.
+
+    Both engines point at the same SQLite file, so creating the schema
+    through the sync engine makes it visible to the async one too. The
+    file lives in the session's throwaway tmpdir, so teardown only
+    releases the pooled connections instead of dropping every table.
+    """
+    Base.metadata.create_all(sync_engine)
+    yield
+    sync_engine.dispose()
+
+
+def _clear_tables():
+    """Delete every row, children first, in a single transaction.
+
+    Tests can't be wrapped in a rolled-back transaction: background jobs
+    write through the sync engine on their own connection and must see the
+    rows the request committed.
+    """
+    with sync_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
 
 
 @pytest_asyncio.fixture
-async def db_session():
-    """Create tables and yield a test database session."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    # Also create tables for the sync engine (used by background tasks)
-    Base.metadata.create_all(sync_engine)
+async def db_session(db_schema):
+    """Yield a test database session; the tables are emptied afterwards."""
     async with async_session_factory() as session:
         yield session
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    Base.metadata.drop_all(sync_engine)
+    _clear_tables()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def session_client():
+    """One ASGI client for the whole session (tests share the session loop)."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
 
 
 @pytest_asyncio.fixture
-async def client(db_session):
-    """HTTP client with overridden DB dependency."""
+async def client(session_client, db_session):
+    """HTTP client with overridden DB dependency.
+
+    Headers and cookies set by a test are restored afterwards so the shared
+    client starts every test unauthenticated.
+
+    Every request runs on the test's single ``db_session``, and an
+    AsyncSession must not be used concurrently: only gather requests when
+    at most one of them touches the database.
+    """
     async def _override_db():
         try:
             yield db_session
@@ -50,106 +99,228 @@ async def client(db_session):
             raise
 
     app.dependency_overrides[get_db] = _override_db
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    headers = session_client.headers.copy()
+    yield session_client
+    session_client.headers = headers
+    session_client.cookies.clear()
     app.dependency_overrides.clear()
 
 
 @pytest_asyncio.fixture
-async def auth_client(client):
-    """Authenticated HTTP client with a pre-registered user."""
-    await client.post("/api/auth/register", json={
-        "email": "test@example.com",
-        "password": "testpass123",
-        "full_name": "Test User",
-    })
-    resp = await client.post("/api/auth/login", json={
-        "email": "test@example.com",
-        "password": "testpass123",
-    })
-    token = resp.json()["access_token"]
-    client.headers["Authorization"] = f"Bearer {token}"
+async def auth_client(client, user_factory):
+    """Authenticated HTTP client for test@example.com (see ``user_factory``)."""
+    user = await user_factory("test@example.com", "testpass123", "Test User")
+    client.headers.update(user["headers"])
     return client
 
 
+# Users registered over HTTP at most once per session, keyed on the
+# database URL plus the factory arguments: the row's id and password hash
+# and the auth headers issued for it.
+_user_cache: dict[tuple, dict] = {}
+
+
+@pytest_asyncio.fixture
+async def user_factory(client, db_session):
+    """Async factory returning ``{"id", "email", "headers"}`` for a user.
+
+    The first call for a given user registers it over HTTP and signs its
+    token in-process (login itself is covered by TestAuth). Tables are
+    emptied after every test, so later calls re-insert the cached row with
+    the same id and hash, which keeps the cached token valid without
+    paying for another bcrypt hash.
+    """
+    from app.core.security import create_access_token
+    from app.models.db_models import User
+
+    async def _make(email, password="p", full_name="", is_admin=False):
+        key = (str(sync_engine.url), email, password, full_name, is_admin)
+        cached = _user_cache.get(key)
+        if cached is None:
+            resp = await client.post("/api/auth/register", json={
+                "email": email, "password": password, "full_name": full_name,
+            })
+            user = await db_session.get(User, resp.json()["id"])
+            user.is_admin = is_admin
+            await db_session.commit()
+            cached = _user_cache[key] = {
+                "id": user.id,
+                "hashed_password": user.hashed_password,
+                "headers": {"Authorization": f"Bearer {create_access_token(user.id)}"},
+            }
+        else:
+            db_session.add(User(
+                id=cached["id"], email=email, full_name=full_name,
+                hashed_password=cached["hashed_password"], is_admin=is_admin,
+            ))
+            await db_session.commit()
+        return {"id": cached["id"], "email": email, "headers": cached["headers"]}
+
+    return _make
+
+
+@pytest_asyncio.fixture
+async def admin_headers(user_factory):
+    """Auth headers for admin@example.com (see ``user_factory``)."""
+    admin = await user_factory("admin@example.com", "adminpass", "Admin User", is_admin=True)
+    return admin["headers"]
+
+
+@pytest_asyncio.fixture
+async def admin_client(client, admin_headers):
+    """The shared client authenticated as the admin (reset by ``client``)."""
+    client.headers.update(admin_headers)
+    return client
+
+
+@pytest_asyncio.fixture
+async def two_users(user_factory):
+    """Two plain users, owner@test.com and viewer@test.com (see ``user_factory``)."""
+    owner = await user_factory("owner@test.com", full_name="Owner")
+    viewer = await user_factory("viewer@test.com", full_name="Viewer")
+    return owner, viewer
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_engine():
+    """Never reach the real engine: jobs take the mock-results path.
+
+    ``_run_job`` picks that path on ``engine.HAS_ENGINE``, so forcing it off
+    keeps the suite independent of whether gpredomicspy is installed.
+    """
+    with patch("app.services.engine.HAS_ENGINE", False):
+        yield
+
+
 @pytest.fixture(autouse=True)
 def clean_data():
-    """Clean data directory between tests."""
+    """Clean data directory between tests.
+
+    Every entry under projects/, uploads/ and datasets/ is removed but the
+    top-level directories stay in place, so tests that never touch disk
+    cost a single empty scandir per directory. Admin defaults saved by a
+    test are removed too, so later runs see the built-in defaults.
+    """
     yield
     data_dir = os.environ["PREDOMICS_DATA_DIR"]
+    try:
+        os.unlink(os.path.join(data_dir, "admin_defaults.json"))
+    except FileNotFoundError:
+        pass
     for d in ["projects", "uploads", "datasets"]:
         p = os.path.join(data_dir, d)
-        if os.path.exists(p):
-            shutil.rmtree(p)
-            os.makedirs(p)
+        if not os.path.isdir(p):
+            continue
+        with os.scandir(p) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-async def _create_project_with_datasets(auth_client):
-    """Create a project with X and y datasets, return (project_id, x_file_id, y_file_id)."""
-    create_resp = await auth_client.post("/api/projects/", params={"name": "test_proj"})
-    pid = create_resp.json()["project_id"]
+async def _seed_project(auth_client, db_session, name, datasets):
+    """Insert a project owned by ``auth_client``'s user, with its datasets.
+
+    ``datasets`` is a list of ``(dataset_name, [(filename, role, content), ...])``;
+    every dataset is assigned to the project. Returns ``(project_id, file_ids)``
+    with the file ids in the order given. Seeds the same rows and files as the
+    project, upload and assign routes, straight through the ORM; those routes
+    are covered by TestDatasets and TestDatasetLibrary.
+    """
+    from app.core.security import decode_access_token
+    from app.models.db_models import Dataset, DatasetFile, Project, ProjectDataset, _new_id
+
+    user_id = decode_access_token(auth_client.headers["Authorization"].removeprefix("Bearer "))
+    project = Project(id=_new_id(), name=name, user_id=user_id)
+    storage.ensure_project_dirs(project.id)
+    rows = [project]
+    file_ids = []
+    for dataset_name, files in datasets:
+        dataset = Dataset(id=_new_id(), name=dataset_name, user_id=user_id)
+        rows += [dataset, ProjectDataset(project_id=project.id, dataset_id=dataset.id)]
+        for filename, role, content in files:
+            file_id = _new_id()
+            disk_path = storage.save_user_dataset_file(user_id, file_id, filename, content)
+            rows.append(DatasetFile(
+                id=file_id, dataset_id=dataset.id, filename=filename, role=role, disk_path=disk_path,
+            ))
+            file_ids.append(file_id)
+    db_session.add_all(rows)
+    await db_session.commit()
+    return project.id, file_ids
 
-    await auth_client.post(
-        f"/api/projects/{pid}/datasets",
-        files={"file": ("X.tsv", b"id\ts1\ts2\nf1\t0.1\t0.2\nf2\t0.3\t0.4\n", "text/plain")},
-    )
-    await auth_client.post(
-        f"/api/projects/{pid}/datasets",
-        files={"file": ("y.tsv", b"id\tclass\ns1\t0\ns2\t1\n", "text/plain")},
-    )
 
-    proj = (await auth_client.get(f"/api/projects/{pid}")).json()
-    datasets = proj["datasets"]
-    # Each upload creates a one-file dataset group; extract file IDs
-    x_file_id = datasets[0]["files"][0]["id"]
-    y_file_id = datasets[1]["files"][0]["id"]
+# Smallest X/y pair the analysis routes accept
+X_TSV = b"id\ts1\ts2\nf1\t0.1\t0.2\nf2\t0.3\t0.4\n"
+Y_TSV = b"id\tclass\ns1\t0\ns2\t1\n"
+
+
+async def _create_project_with_datasets(auth_client, db_session):
+    """Create a project with X and y datasets, return (project_id, x_file_id, y_file_id)."""
+    pid, (x_file_id, y_file_id) = await _seed_project(auth_client, db_session, "test_proj", [
+        ("X.tsv", [("X.tsv", "xtrain", X_TSV)]),
+        ("y.tsv", [("y.tsv", "ytrain", Y_TSV)]),
+    ])
     return pid, x_file_id, y_file_id
 
 
+@pytest_asyncio.fixture
+async def project_id(auth_client, db_session):
+    """An empty project owned by test@example.com, seeded through the ORM.
+
+    For tests that only need somewhere to upload, run or share; the create
+    route itself is covered by TestProjects.
+    """
+    pid, _ = await _seed_project(auth_client, db_session, "test_proj", [])
+    return pid
+
+
+MOCK_CONFIG = {
+    "general": {"algo": "ga", "language": "bin", "data_type": "raw", "fit": "auc",
+                "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
+    "ga": {"population_size": 50, "max_epochs": 2, "k_min": 1, "k_max": 10},
+}
+
+
 async def _run_mock_analysis(auth_client, pid, x_file_id, y_file_id):
     """Run a mock analysis job, return the job_id."""
-    config = {
-        "general": {"algo": "ga", "language": "bin", "data_type": "raw", "fit": "auc",
-                    "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
-        "ga": {"population_size": 50, "max_epochs": 2, "k_min": 1, "k_max": 10},
-    }
-
-    with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-        resp = await auth_client.post(
-            f"/api/analysis/{pid}/run",
-            json=config,
-            params={"x_file_id": x_file_id, "y_file_id": y_file_id},
-        )
+    resp = await auth_client.post(
+        f"/api/analysis/{pid}/run",
+        json=MOCK_CONFIG,
+        params={"x_file_id": x_file_id, "y_file_id": y_file_id},
+    )
     return resp.json()["job_id"]
 
 
 async def _create_completed_job(auth_client, db_session):
-    """Create a project, run a mock analysis, save results, mark as completed.
+    """Create a project holding a completed job with the mock results.
 
+    The Job row is inserted straight through the ORM and the results written
+    to disk; the /run path itself is covered by TestAnalysis.
     Returns (project_id, job_id).
     """
-    from sqlalchemy import text
-
-    pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
-    job_id = await _run_mock_analysis(auth_client, pid, x_fid, y_fid)
-
-    # Save mock results to disk
-    mock = ml_engine._mock_results()
-    storage.save_job_result(pid, job_id, mock)
-
-    # Mark job as completed in the database
-    await db_session.execute(
-        text("UPDATE jobs SET status = 'completed' WHERE id = :jid"),
-        {"jid": job_id},
+    from app.core.security import decode_access_token
+    from app.models.db_models import Job
+    from app.routers.analysis import _compute_config_hash
+
+    pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
+    user_id = decode_access_token(auth_client.headers["Authorization"].removeprefix("Bearer "))
+    job = Job(
+        project_id=pid, user_id=user_id, status="completed", config=MOCK_CONFIG,
+        config_hash=_compute_config_hash(MOCK_CONFIG, {
+            "x": x_fid, "y": y_fid, "xtest": None, "ytest": None,
+        }),
     )
+    db_session.add(job)
     await db_session.commit()
+    storage.save_job_result(pid, job.id, MOCK_RESULTS)
 
-    return pid, job_id
+    return pid, job.id
 
 
 # ---------------------------------------------------------------------------
@@ -254,8 +425,9 @@ class TestProjects:
     async def test_list_projects_after_create(self, auth_client):
         await auth_client.post("/api/projects/", params={"name": "P1"})
         resp = await auth_client.get("/api/projects/")
-        assert len(resp.json()) == 1
-        assert resp.json()[0]["name"] == "P1"
+        projects = resp.json()
+        assert len(projects) == 1
+        assert projects[0]["name"] == "P1"
 
     @pytest.mark.asyncio
     async def test_get_project_by_id(self, auth_client):
@@ -270,16 +442,6 @@ class TestProjects:
         resp = await auth_client.get("/api/projects/nonexistent")
         assert resp.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_delete_project(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "Del"})
-        pid = create_resp.json()["project_id"]
-        resp = await auth_client.delete(f"/api/projects/{pid}")
-        assert resp.status_code == 200
-
-        resp = await auth_client.get(f"/api/projects/{pid}")
-        assert resp.status_code == 404
-
     @pytest.mark.asyncio
     async def test_delete_nonexistent_project_returns_404(self, auth_client):
         resp = await auth_client.delete("/api/projects/nonexistent")
@@ -304,44 +466,33 @@ class TestProjects:
 
 class TestDatasets:
     @pytest.mark.asyncio
-    async def test_upload_tsv_dataset(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "ds_test"})
-        pid = create_resp.json()["project_id"]
-        resp = await auth_client.post(
-            f"/api/projects/{pid}/datasets",
-            files={"file": ("X.tsv", b"id\ts1\ts2\nf1\t0.1\t0.2\n", "text/plain")},
-        )
-        assert resp.status_code == 200
-        assert resp.json()["filename"] == "X.tsv"
-
-    @pytest.mark.asyncio
-    async def test_upload_csv_dataset(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "csv_test"})
-        pid = create_resp.json()["project_id"]
+    @pytest.mark.parametrize("filename,content", [
+        ("X.tsv", b"id\ts1\ts2\nf1\t0.1\t0.2\n"),
+        ("data.csv", b"id,s1,s2\nf1,0.1,0.2\n"),
+    ])
+    async def test_upload_dataset(self, auth_client, project_id, filename, content):
         resp = await auth_client.post(
-            f"/api/projects/{pid}/datasets",
-            files={"file": ("data.csv", b"id,s1,s2\nf1,0.1,0.2\n", "text/plain")},
+            f"/api/projects/{project_id}/datasets",
+            files={"file": (filename, content, "text/plain")},
         )
         assert resp.status_code == 200
-        assert resp.json()["filename"] == "data.csv"
+        assert resp.json()["filename"] == filename
 
     @pytest.mark.asyncio
     async def test_upload_to_nonexistent_project_returns_404(self, auth_client):
         resp = await auth_client.post(
             "/api/projects/nonexistent/datasets",
-            files={"file": ("X.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
+            files={"file": ("X.tsv", X_TSV, "text/plain")},
         )
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_upload_updates_project_metadata(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "meta_test"})
-        pid = create_resp.json()["project_id"]
+    async def test_upload_updates_project_metadata(self, auth_client, project_id):
         await auth_client.post(
-            f"/api/projects/{pid}/datasets",
-            files={"file": ("X.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
+            f"/api/projects/{project_id}/datasets",
+            files={"file": ("X.tsv", X_TSV, "text/plain")},
         )
-        resp = await auth_client.get(f"/api/projects/{pid}")
+        resp = await auth_client.get(f"/api/projects/{project_id}")
         datasets = resp.json()["datasets"]
         assert len(datasets) == 1
         assert datasets[0]["name"] == "X.tsv"
@@ -349,18 +500,16 @@ class TestDatasets:
         assert datasets[0]["files"][0]["filename"] == "X.tsv"
 
     @pytest.mark.asyncio
-    async def test_upload_multiple_datasets(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "multi_ds"})
-        pid = create_resp.json()["project_id"]
+    async def test_upload_multiple_datasets(self, auth_client, project_id):
         await auth_client.post(
-            f"/api/projects/{pid}/datasets",
-            files={"file": ("X.tsv", b"id\ts1\ts2\nf1\t0.1\t0.2\n", "text/plain")},
+            f"/api/projects/{project_id}/datasets",
+            files={"file": ("X.tsv", X_TSV, "text/plain")},
         )
         await auth_client.post(
-            f"/api/projects/{pid}/datasets",
-            files={"file": ("y.tsv", b"id\tclass\ns1\t0\ns2\t1\n", "text/plain")},
+            f"/api/projects/{project_id}/datasets",
+            files={"file": ("y.tsv", Y_TSV, "text/plain")},
         )
-        resp = await auth_client.get(f"/api/projects/{pid}")
+        resp = await auth_client.get(f"/api/projects/{project_id}")
         assert len(resp.json()["datasets"]) == 2
 
 
@@ -370,44 +519,38 @@ class TestDatasets:
 
 class TestAnalysis:
     @pytest.mark.asyncio
-    async def test_run_analysis_returns_job_id(self, auth_client):
-        pid, x_id, y_id = await _create_project_with_datasets(auth_client)
+    async def test_run_analysis_returns_job_id(self, auth_client, db_session):
+        pid, x_id, y_id = await _create_project_with_datasets(auth_client, db_session)
         job_id = await _run_mock_analysis(auth_client, pid, x_id, y_id)
         assert job_id  # non-empty string
 
     @pytest.mark.asyncio
-    async def test_get_job_status_nonexistent_returns_404(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "status_test"})
-        pid = create_resp.json()["project_id"]
-        resp = await auth_client.get(f"/api/analysis/{pid}/jobs/nonexistent")
+    async def test_get_job_status_nonexistent_returns_404(self, auth_client, project_id):
+        resp = await auth_client.get(f"/api/analysis/{project_id}/jobs/nonexistent")
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_list_jobs_empty(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "jobs_test"})
-        pid = create_resp.json()["project_id"]
-        resp = await auth_client.get(f"/api/analysis/{pid}/jobs")
+    async def test_list_jobs_empty(self, auth_client, project_id):
+        resp = await auth_client.get(f"/api/analysis/{project_id}/jobs")
         assert resp.status_code == 200
         assert resp.json() == []
 
     @pytest.mark.asyncio
-    async def test_list_jobs_after_run(self, auth_client):
-        pid, x_id, y_id = await _create_project_with_datasets(auth_client)
+    async def test_list_jobs_after_run(self, auth_client, db_session):
+        pid, x_id, y_id = await _create_project_with_datasets(auth_client, db_session)
         await _run_mock_analysis(auth_client, pid, x_id, y_id)
         resp = await auth_client.get(f"/api/analysis/{pid}/jobs")
         assert resp.status_code == 200
         assert len(resp.json()) == 1
 
     @pytest.mark.asyncio
-    async def test_get_job_logs_nonexistent_returns_404(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "log_test"})
-        pid = create_resp.json()["project_id"]
-        resp = await auth_client.get(f"/api/analysis/{pid}/jobs/nonexistent/logs")
+    async def test_get_job_logs_nonexistent_returns_404(self, auth_client, project_id):
+        resp = await auth_client.get(f"/api/analysis/{project_id}/jobs/nonexistent/logs")
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_get_job_logs_returns_log_content(self, auth_client):
-        pid, x_id, y_id = await _create_project_with_datasets(auth_client)
+    async def test_get_job_logs_returns_log_content(self, auth_client, db_session):
+        pid, x_id, y_id = await _create_project_with_datasets(auth_client, db_session)
         job_id = await _run_mock_analysis(auth_client, pid, x_id, y_id)
 
         # Write a fake console.log for the job
@@ -422,58 +565,49 @@ class TestAnalysis:
         assert "Starting analysis" in data["log"]
 
     @pytest.mark.asyncio
-    async def test_get_job_detail_nonexistent_returns_404(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "detail_test"})
-        pid = create_resp.json()["project_id"]
-        resp = await auth_client.get(f"/api/analysis/{pid}/jobs/nonexistent/detail")
+    async def test_get_job_detail_nonexistent_returns_404(self, auth_client, project_id):
+        resp = await auth_client.get(f"/api/analysis/{project_id}/jobs/nonexistent/detail")
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_get_job_detail_with_results(self, auth_client):
-        pid, x_id, y_id = await _create_project_with_datasets(auth_client)
+    async def test_get_job_detail_with_results(self, auth_client, db_session):
+        pid, x_id, y_id = await _create_project_with_datasets(auth_client, db_session)
         job_id = await _run_mock_analysis(auth_client, pid, x_id, y_id)
 
         # Save mock results to disk
-        mock = ml_engine._mock_results()
-        storage.save_job_result(pid, job_id, mock)
+        storage.save_job_result(pid, job_id, MOCK_RESULTS)
 
         resp = await auth_client.get(f"/api/analysis/{pid}/jobs/{job_id}/detail")
         assert resp.status_code == 200
         data = resp.json()
         assert data["job_id"] == job_id
-        assert data["best_auc"] == mock["best_individual"]["auc"]
-        assert data["best_k"] == mock["best_individual"]["k"]
+        assert data["best_auc"] == MOCK_RESULTS["best_individual"]["auc"]
+        assert data["best_k"] == MOCK_RESULTS["best_individual"]["k"]
         assert len(data["feature_names"]) == 50
 
     @pytest.mark.asyncio
-    async def test_get_job_results_raw(self, auth_client):
-        pid, x_id, y_id = await _create_project_with_datasets(auth_client)
+    async def test_get_job_results_raw(self, auth_client, db_session):
+        pid, x_id, y_id = await _create_project_with_datasets(auth_client, db_session)
         job_id = await _run_mock_analysis(auth_client, pid, x_id, y_id)
 
-        mock = ml_engine._mock_results()
-        storage.save_job_result(pid, job_id, mock)
+        storage.save_job_result(pid, job_id, MOCK_RESULTS)
 
         resp = await auth_client.get(f"/api/analysis/{pid}/jobs/{job_id}/results")
         assert resp.status_code == 200
         data = resp.json()
         assert "best_individual" in data
         assert "feature_names" in data
-        assert data["generation_count"] == mock["generation_count"]
+        assert data["generation_count"] == MOCK_RESULTS["generation_count"]
 
     @pytest.mark.asyncio
-    async def test_get_job_results_raw_nonexistent_returns_404(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "raw_test"})
-        pid = create_resp.json()["project_id"]
-        resp = await auth_client.get(f"/api/analysis/{pid}/jobs/nonexistent/results")
+    async def test_get_job_results_raw_nonexistent_returns_404(self, auth_client, project_id):
+        resp = await auth_client.get(f"/api/analysis/{project_id}/jobs/nonexistent/results")
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_run_analysis_missing_datasets_returns_404(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "no_ds"})
-        pid = create_resp.json()["project_id"]
-
+    async def test_run_analysis_missing_datasets_returns_404(self, auth_client, project_id):
         resp = await auth_client.post(
-            f"/api/analysis/{pid}/run",
+            f"/api/analysis/{project_id}/run",
             json={},
             params={"x_file_id": "nonexistent", "y_file_id": "nonexistent"},
         )
@@ -486,68 +620,53 @@ class TestAnalysis:
 
 class TestSchemaValidation:
     @pytest.mark.asyncio
-    async def test_run_with_invalid_algo_returns_422(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "val_test"})
-        pid = create_resp.json()["project_id"]
-
-        config = {"general": {"algo": "invalid_algo"}}
+    @pytest.mark.parametrize("general", [
+        {"algo": "invalid_algo"},
+        {"fit": "invalid_fit"},
+        {"seed": "not_a_number"},
+    ])
+    async def test_run_with_invalid_general_params_returns_422(self, auth_client, project_id, general):
         resp = await auth_client.post(
-            f"/api/analysis/{pid}/run",
-            json=config,
+            f"/api/analysis/{project_id}/run",
+            json={"general": general},
             params={"x_file_id": "abc", "y_file_id": "def"},
         )
         assert resp.status_code == 422
 
     @pytest.mark.asyncio
-    async def test_run_with_invalid_fit_returns_422(self, auth_client):
-        create_resp = await auth_client.post("/api/projects/", params={"name": "fit_test"})
-        pid = create_resp.json()["project_id"]
+    async def test_run_with_defaults_accepts_empty_config(self, auth_client, db_session):
+        """RunConfig should have sensible defaults for all fields."""
+        pid, x_id, y_id = await _create_project_with_datasets(auth_client, db_session)
 
-        config = {"general": {"fit": "invalid_fit"}}
         resp = await auth_client.post(
             f"/api/analysis/{pid}/run",
-            json=config,
-            params={"x_file_id": "abc", "y_file_id": "def"},
+            json={},
+            params={"x_file_id": x_id, "y_file_id": y_id},
         )
-        assert resp.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_run_with_defaults_accepts_empty_config(self, auth_client):
-        """RunConfig should have sensible defaults for all fields."""
-        pid, x_id, y_id = await _create_project_with_datasets(auth_client)
-
-        with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-            resp = await auth_client.post(
-                f"/api/analysis/{pid}/run",
-                json={},
-                params={"x_file_id": x_id, "y_file_id": y_id},
-            )
         assert resp.status_code == 200
 
     @pytest.mark.asyncio
-    async def test_run_with_beam_algorithm(self, auth_client):
-        pid, x_id, y_id = await _create_project_with_datasets(auth_client)
+    async def test_run_with_beam_algorithm(self, auth_client, db_session):
+        pid, x_id, y_id = await _create_project_with_datasets(auth_client, db_session)
 
         config = {"general": {"algo": "beam"}}
-        with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-            resp = await auth_client.post(
-                f"/api/analysis/{pid}/run",
-                json=config,
-                params={"x_file_id": x_id, "y_file_id": y_id},
-            )
+        resp = await auth_client.post(
+            f"/api/analysis/{pid}/run",
+            json=config,
+            params={"x_file_id": x_id, "y_file_id": y_id},
+        )
         assert resp.status_code == 200
 
     @pytest.mark.asyncio
-    async def test_run_with_mcmc_algorithm(self, auth_client):
-        pid, x_id, y_id = await _create_project_with_datasets(auth_client)
+    async def test_run_with_mcmc_algorithm(self, auth_client, db_session):
+        pid, x_id, y_id = await _create_project_with_datasets(auth_client, db_session)
 
         config = {"general": {"algo": "mcmc"}}
-        with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-            resp = await auth_client.post(
-                f"/api/analysis/{pid}/run",
-                json=config,
-                params={"x_file_id": x_id, "y_file_id": y_id},
-            )
+        resp = await auth_client.post(
+            f"/api/analysis/{pid}/run",
+            json=config,
+            params={"x_file_id": x_id, "y_file_id": y_id},
+        )
         assert resp.status_code == 200
 
 
@@ -555,6 +674,22 @@ class TestSchemaValidation:
 # Samples (demo data)
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def sample_files():
+    """Write a fake qin2014_cirrhosis demo once for the module.
+
+    Each demo lives in its own subdir under settings.samples_dir (env:
+    PREDOMICS_SAMPLES_DIR), which ``clean_data`` leaves alone.
+    """
+    sample_dir = Path(os.environ["PREDOMICS_SAMPLES_DIR"]) / "qin2014_cirrhosis"
+    sample_dir.mkdir(parents=True, exist_ok=True)
+    (sample_dir / "Xtrain.tsv").write_text("id\ts1\ts2\nf1\t0.1\t0.2\n")
+    (sample_dir / "Ytrain.tsv").write_text("id\tclass\ns1\t0\ns2\t1\n")
+    (sample_dir / "Xtest.tsv").write_text("id\ts3\nf1\t0.3\n")
+    (sample_dir / "Ytest.tsv").write_text("id\tclass\ns3\t1\n")
+    return sample_dir
+
+
 class TestSamples:
     @pytest.mark.asyncio
     async def test_list_samples_returns_list(self, auth_client):
@@ -582,16 +717,7 @@ class TestSamples:
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_load_sample_creates_project(self, auth_client):
-        # Create a fake sample directory with files. Each demo lives in its
-        # own subdir under settings.samples_dir (env: PREDOMICS_SAMPLES_DIR).
-        sample_dir = Path(os.environ["PREDOMICS_SAMPLES_DIR"]) / "qin2014_cirrhosis"
-        sample_dir.mkdir(parents=True, exist_ok=True)
-        (sample_dir / "Xtrain.tsv").write_text("id\ts1\ts2\nf1\t0.1\t0.2\n")
-        (sample_dir / "Ytrain.tsv").write_text("id\tclass\ns1\t0\ns2\t1\n")
-        (sample_dir / "Xtest.tsv").write_text("id\ts3\nf1\t0.3\n")
-        (sample_dir / "Ytest.tsv").write_text("id\tclass\ns3\t1\n")
-
+    async def test_load_sample_creates_project(self, auth_client, sample_files):
         resp = await auth_client.post("/api/samples/qin2014_cirrhosis/load")
         assert resp.status_code == 200
         data = resp.json()
@@ -601,15 +727,8 @@ class TestSamples:
         assert len(data["datasets"][0]["files"]) == 4
 
     @pytest.mark.asyncio
-    async def test_load_sample_twice_returns_same_project(self, auth_client):
+    async def test_load_sample_twice_returns_same_project(self, auth_client, sample_files):
         """Loading the same demo twice must NOT create a duplicate project."""
-        sample_dir = Path(os.environ["PREDOMICS_SAMPLES_DIR"]) / "qin2014_cirrhosis"
-        sample_dir.mkdir(parents=True, exist_ok=True)
-        (sample_dir / "Xtrain.tsv").write_text("id\ts1\ts2\nf1\t0.1\t0.2\n")
-        (sample_dir / "Ytrain.tsv").write_text("id\tclass\ns1\t0\ns2\t1\n")
-        (sample_dir / "Xtest.tsv").write_text("id\ts3\nf1\t0.3\n")
-        (sample_dir / "Ytest.tsv").write_text("id\tclass\ns3\t1\n")
-
         resp1 = await auth_client.post("/api/samples/qin2014_cirrhosis/load")
         resp2 = await auth_client.post("/api/samples/qin2014_cirrhosis/load")
         assert resp1.json()["project_id"] == resp2.json()["project_id"]
@@ -626,59 +745,38 @@ class TestSamples:
 
 class TestProjectIsolation:
     @pytest.mark.asyncio
-    async def test_user_cannot_see_other_users_projects(self, client):
-        # Register two users
-        await client.post("/api/auth/register", json={"email": "a@x.com", "password": "p"})
-        await client.post("/api/auth/register", json={"email": "b@x.com", "password": "p"})
+    async def test_user_cannot_see_other_users_projects(self, client, two_users):
+        user_a, user_b = two_users
 
         # User A creates a project
-        r = await client.post("/api/auth/login", json={"email": "a@x.com", "password": "p"})
-        token_a = r.json()["access_token"]
-        await client.post("/api/projects/", params={"name": "a_proj"},
-                          headers={"Authorization": f"Bearer {token_a}"})
+        await client.post("/api/projects/", params={"name": "a_proj"}, headers=user_a["headers"])
 
         # User B should not see it
-        r = await client.post("/api/auth/login", json={"email": "b@x.com", "password": "p"})
-        token_b = r.json()["access_token"]
-        resp = await client.get("/api/projects/",
-                                headers={"Authorization": f"Bearer {token_b}"})
+        resp = await client.get("/api/projects/", headers=user_b["headers"])
         assert resp.json() == []
 
     @pytest.mark.asyncio
-    async def test_user_cannot_access_other_users_project(self, client):
-        # Register two users
-        await client.post("/api/auth/register", json={"email": "own@x.com", "password": "p"})
-        await client.post("/api/auth/register", json={"email": "other@x.com", "password": "p"})
+    async def test_user_cannot_access_other_users_project(self, client, two_users):
+        owner, other = two_users
 
         # User A creates a project
-        r = await client.post("/api/auth/login", json={"email": "own@x.com", "password": "p"})
-        token_a = r.json()["access_token"]
         create_resp = await client.post("/api/projects/", params={"name": "private_proj"},
-                                         headers={"Authorization": f"Bearer {token_a}"})
+                                         headers=owner["headers"])
         pid = create_resp.json()["project_id"]
 
         # User B cannot access it
-        r = await client.post("/api/auth/login", json={"email": "other@x.com", "password": "p"})
-        token_b = r.json()["access_token"]
-        resp = await client.get(f"/api/projects/{pid}",
-                                headers={"Authorization": f"Bearer {token_b}"})
+        resp = await client.get(f"/api/projects/{pid}", headers=other["headers"])
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_user_cannot_delete_other_users_project(self, client):
-        await client.post("/api/auth/register", json={"email": "own2@x.com", "password": "p"})
-        await client.post("/api/auth/register", json={"email": "other2@x.com", "password": "p"})
+    async def test_user_cannot_delete_other_users_project(self, client, two_users):
+        owner, other = two_users
 
-        r = await client.post("/api/auth/login", json={"email": "own2@x.com", "password": "p"})
-        token_a = r.json()["access_token"]
         create_resp = await client.post("/api/projects/", params={"name": "protected"},
-                                         headers={"Authorization": f"Bearer {token_a}"})
+                                         headers=owner["headers"])
         pid = create_resp.json()["project_id"]
 
-        r = await client.post("/api/auth/login", json={"email": "other2@x.com", "password": "p"})
-        token_b = r.json()["access_token"]
-        resp = await client.delete(f"/api/projects/{pid}",
-                                   headers={"Authorization": f"Bearer {token_b}"})
+        resp = await client.delete(f"/api/projects/{pid}", headers=other["headers"])
         assert resp.status_code == 404
 
 
@@ -707,13 +805,12 @@ class TestStorage:
         assert result is None
 
     def test_save_and_get_job_result(self):
-        mock = ml_engine._mock_results()
-        path = storage.save_job_result("test_proj", "job1", mock)
+        path = storage.save_job_result("test_proj", "job1", MOCK_RESULTS)
         assert os.path.exists(path)
 
         loaded = storage.get_job_result("test_proj", "job1")
         assert loaded is not None
-        assert loaded["best_individual"]["auc"] == mock["best_individual"]["auc"]
+        assert loaded["best_individual"]["auc"] == MOCK_RESULTS["best_individual"]["auc"]
 
     def test_get_job_result_nonexistent(self):
         result = storage.get_job_result("nonexistent_proj", "nonexistent_job")
@@ -744,7 +841,6 @@ class TestEngine:
                         "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
             "ga": {"population_size": 100, "max_epochs": 5, "k_min": 1, "k_max": 10},
         }
-        import yaml
         with tempfile.TemporaryDirectory() as tmp:
             path = ml_engine.write_param_yaml(
                 config, x_path="/data/X.tsv", y_path="/data/y.tsv", output_dir=tmp
@@ -757,14 +853,13 @@ class TestEngine:
             assert param["ga"]["population_size"] == 100
 
     def test_mock_results_structure(self):
-        mock = ml_engine._mock_results()
-        assert "fold_count" in mock
-        assert "generation_count" in mock
-        assert "execution_time" in mock
-        assert "feature_names" in mock
-        assert "sample_names" in mock
-        assert "best_individual" in mock
-        best = mock["best_individual"]
+        assert "fold_count" in MOCK_RESULTS
+        assert "generation_count" in MOCK_RESULTS
+        assert "execution_time" in MOCK_RESULTS
+        assert "feature_names" in MOCK_RESULTS
+        assert "sample_names" in MOCK_RESULTS
+        assert "best_individual" in MOCK_RESULTS
+        best = MOCK_RESULTS["best_individual"]
         assert "auc" in best
         assert "fit" in best
         assert "k" in best
@@ -787,6 +882,16 @@ class TestSecurity:
         assert verify_password("mysecret", hashed)
         assert not verify_password("wrongpass", hashed)
 
+    def test_hash_password_uses_configured_rounds(self):
+        import bcrypt
+        from app.core.config import settings
+        from app.core.security import hash_password, verify_password
+        # The suite runs at PREDOMICS_BCRYPT_ROUNDS=4; hashes made at the
+        # production cost must still verify since the cost is read from the hash
+        assert hash_password("mysecret").split("$")[2] == f"{settings.bcrypt_rounds:02d}"
+        prod_hash = bcrypt.hashpw(b"mysecret", bcrypt.gensalt(rounds=12)).decode()
+        assert verify_password("mysecret", prod_hash)
+
     def test_create_and_decode_token(self):
         from app.core.security import create_access_token, decode_access_token
         token = create_access_token("user123")
@@ -821,7 +926,11 @@ class TestUserProfile:
         assert resp.json()["full_name"] == "Test User"  # unchanged
 
     @pytest.mark.asyncio
-    async def test_change_password_success(self, auth_client):
+    async def test_change_password_success(self, auth_client, db_session):
+        from sqlalchemy import select
+        from app.core.security import verify_password
+        from app.models.db_models import User
+
         resp = await auth_client.put("/api/auth/me/password", json={
             "current_password": "testpass123",
             "new_password": "newpass456",
@@ -829,13 +938,12 @@ class TestUserProfile:
         assert resp.status_code == 200
         assert resp.json()["status"] == "password_changed"
 
-        # Login with new password
-        resp = await auth_client.post("/api/auth/login", json={
-            "email": "test@example.com",
-            "password": "newpass456",
-        })
-        assert resp.status_code == 200
-        assert "access_token" in resp.json()
+        # The stored hash now matches the new password (login is covered by TestAuth)
+        hashed = await db_session.scalar(
+            select(User.hashed_password).where(User.email == "test@example.com")
+        )
+        assert verify_password("newpass456", hashed)
+        assert not verify_password("testpass123", hashed)
 
     @pytest.mark.asyncio
     async def test_change_password_wrong_current(self, auth_client):
@@ -846,16 +954,12 @@ class TestUserProfile:
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_search_users_by_email(self, client):
+    async def test_search_users_by_email(self, client, user_factory):
         # Register multiple users
-        await client.post("/api/auth/register", json={"email": "alice@example.com", "password": "p", "full_name": "Alice"})
-        await client.post("/api/auth/register", json={"email": "bob@example.com", "password": "p", "full_name": "Bob"})
-        await client.post("/api/auth/register", json={"email": "alice2@example.com", "password": "p", "full_name": "Alice2"})
-
-        # Login as bob
-        r = await client.post("/api/auth/login", json={"email": "bob@example.com", "password": "p"})
-        token = r.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
+        await user_factory("alice@example.com", full_name="Alice")
+        bob = await user_factory("bob@example.com", full_name="Bob")
+        await user_factory("alice2@example.com", full_name="Alice2")
+        headers = bob["headers"]
 
         # Search for "alice" — should find 2 results, not bob
         resp = await client.get("/api/auth/users/search", params={"q": "alice"}, headers=headers)
@@ -907,11 +1011,12 @@ class TestDatasetLibrary:
         # Upload file into group
         resp = await auth_client.post(
             f"/api/datasets/{ds_id}/files",
-            files={"file": ("Xtrain.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
+            files={"file": ("Xtrain.tsv", X_TSV, "text/plain")},
         )
         assert resp.status_code == 200
-        assert resp.json()["filename"] == "Xtrain.tsv"
-        assert resp.json()["role"] == "xtrain"
+        data = resp.json()
+        assert data["filename"] == "Xtrain.tsv"
+        assert data["role"] == "xtrain"
 
     @pytest.mark.asyncio
     async def test_list_datasets(self, auth_client):
@@ -936,7 +1041,7 @@ class TestDatasetLibrary:
         ds_id = ds_resp.json()["id"]
         file_resp = await auth_client.post(
             f"/api/datasets/{ds_id}/files",
-            files={"file": ("X.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
+            files={"file": ("X.tsv", X_TSV, "text/plain")},
         )
         file_id = file_resp.json()["id"]
 
@@ -948,42 +1053,36 @@ class TestDatasetLibrary:
         assert len(ds["files"]) == 0
 
     @pytest.mark.asyncio
-    async def test_assign_dataset_to_project(self, auth_client):
+    async def test_assign_dataset_to_project(self, auth_client, project_id):
         # Create dataset group with a file
         ds_resp = await auth_client.post("/api/datasets/", params={"name": "Xtrain Set"})
         ds_id = ds_resp.json()["id"]
         await auth_client.post(
             f"/api/datasets/{ds_id}/files",
-            files={"file": ("Xtrain.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
+            files={"file": ("Xtrain.tsv", X_TSV, "text/plain")},
         )
 
-        # Create project
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "assign_test"})
-        pid = proj_resp.json()["project_id"]
-
         # Assign
-        resp = await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
+        resp = await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
         assert resp.status_code == 200
 
         # Project should show the dataset with its files
-        proj = (await auth_client.get(f"/api/projects/{pid}")).json()
+        proj = (await auth_client.get(f"/api/projects/{project_id}")).json()
         assert len(proj["datasets"]) == 1
         assert proj["datasets"][0]["name"] == "Xtrain Set"
         assert len(proj["datasets"][0]["files"]) == 1
         assert proj["datasets"][0]["files"][0]["role"] == "xtrain"
 
     @pytest.mark.asyncio
-    async def test_unassign_dataset_from_project(self, auth_client):
+    async def test_unassign_dataset_from_project(self, auth_client, project_id):
         ds_resp = await auth_client.post("/api/datasets/", params={"name": "Unassign DS"})
         ds_id = ds_resp.json()["id"]
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "unassign_test"})
-        pid = proj_resp.json()["project_id"]
 
-        await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
-        resp = await auth_client.delete(f"/api/datasets/{ds_id}/assign/{pid}")
+        await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
+        resp = await auth_client.delete(f"/api/datasets/{ds_id}/assign/{project_id}")
         assert resp.status_code == 200
 
-        proj = (await auth_client.get(f"/api/projects/{pid}")).json()
+        proj = (await auth_client.get(f"/api/projects/{project_id}")).json()
         assert len(proj["datasets"]) == 0
 
     @pytest.mark.asyncio
@@ -1003,16 +1102,14 @@ class TestDatasetLibrary:
         assert ds_detail["project_count"] == 2
 
     @pytest.mark.asyncio
-    async def test_delete_project_keeps_datasets(self, auth_client):
+    async def test_delete_project_keeps_datasets(self, auth_client, project_id):
         """Deleting a project should NOT delete the user's datasets."""
         ds_resp = await auth_client.post("/api/datasets/", params={"name": "Keep Me"})
         ds_id = ds_resp.json()["id"]
 
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "temp_proj"})
-        pid = proj_resp.json()["project_id"]
 
-        await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
-        await auth_client.delete(f"/api/projects/{pid}")
+        await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
+        await auth_client.delete(f"/api/projects/{project_id}")
 
         # Dataset should still exist in library
         resp = await auth_client.get(f"/api/datasets/{ds_id}")
@@ -1020,14 +1117,11 @@ class TestDatasetLibrary:
         assert resp.json()["name"] == "Keep Me"
 
     @pytest.mark.asyncio
-    async def test_backward_compat_project_upload_creates_library_entry(self, auth_client):
+    async def test_backward_compat_project_upload_creates_library_entry(self, auth_client, project_id):
         """POST /projects/{pid}/datasets should also create a library entry."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "compat_test"})
-        pid = proj_resp.json()["project_id"]
-
         await auth_client.post(
-            f"/api/projects/{pid}/datasets",
-            files={"file": ("X.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
+            f"/api/projects/{project_id}/datasets",
+            files={"file": ("X.tsv", X_TSV, "text/plain")},
         )
 
         # Should appear in user's dataset library
@@ -1035,14 +1129,12 @@ class TestDatasetLibrary:
         assert any(d["name"] == "X.tsv" for d in library)
 
     @pytest.mark.asyncio
-    async def test_duplicate_assignment_returns_409(self, auth_client):
+    async def test_duplicate_assignment_returns_409(self, auth_client, project_id):
         ds_resp = await auth_client.post("/api/datasets/", params={"name": "Dup DS"})
         ds_id = ds_resp.json()["id"]
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "dup_test"})
-        pid = proj_resp.json()["project_id"]
 
-        await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
-        resp = await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
+        await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
+        resp = await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
         assert resp.status_code == 409
 
     @pytest.mark.asyncio
@@ -1056,7 +1148,7 @@ class TestDatasetLibrary:
         for fname in ["Xtrain.tsv", "Ytrain.tsv", "Xtest.tsv", "Ytest.tsv"]:
             await auth_client.post(
                 f"/api/datasets/{ds_id}/files",
-                files={"file": (fname, b"id\ts1\nf1\t0.1\n", "text/plain")},
+                files={"file": (fname, X_TSV, "text/plain")},
             )
 
         ds = (await auth_client.get(f"/api/datasets/{ds_id}")).json()
@@ -1074,17 +1166,12 @@ class TestDatasetLibrary:
 
 class TestProjectSharing:
     @pytest.mark.asyncio
-    async def test_share_project_with_user(self, client):
+    async def test_share_project_with_user(self, client, two_users):
         """Owner shares project → target can see it."""
-        # Register two users
-        await client.post("/api/auth/register", json={"email": "owner@test.com", "password": "p", "full_name": "Owner"})
-        await client.post("/api/auth/register", json={"email": "viewer@test.com", "password": "p", "full_name": "Viewer"})
+        owner, viewer = two_users
+        owner_h = owner["headers"]
 
         # Owner creates project
-        r = await client.post("/api/auth/login", json={"email": "owner@test.com", "password": "p"})
-        owner_token = r.json()["access_token"]
-        owner_h = {"Authorization": f"Bearer {owner_token}"}
-
         proj = await client.post("/api/projects/", params={"name": "shared_proj"}, headers=owner_h)
         pid = proj.json()["project_id"]
 
@@ -1096,112 +1183,64 @@ class TestProjectSharing:
         )
         assert resp.status_code == 200
 
-        # Viewer logs in and can see shared project
-        r = await client.post("/api/auth/login", json={"email": "viewer@test.com", "password": "p"})
-        viewer_token = r.json()["access_token"]
-        viewer_h = {"Authorization": f"Bearer {viewer_token}"}
-
-        shared = await client.get("/api/projects/shared-with-me", headers=viewer_h)
-        assert len(shared.json()) == 1
-        assert shared.json()[0]["project_id"] == pid
+        # Viewer can see shared project
+        shared = (await client.get("/api/projects/shared-with-me", headers=viewer["headers"])).json()
+        assert len(shared) == 1
+        assert shared[0]["project_id"] == pid
 
     @pytest.mark.asyncio
-    async def test_viewer_can_see_project(self, client):
+    async def test_viewer_can_see_project(self, client, two_users):
         """Viewer can GET /projects/{pid}."""
-        await client.post("/api/auth/register", json={"email": "own3@test.com", "password": "p"})
-        await client.post("/api/auth/register", json={"email": "view3@test.com", "password": "p"})
-
-        r = await client.post("/api/auth/login", json={"email": "own3@test.com", "password": "p"})
-        own_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        owner, viewer = two_users
+        own_h, view_h = owner["headers"], viewer["headers"]
         pid = (await client.post("/api/projects/", params={"name": "viewable"}, headers=own_h)).json()["project_id"]
 
-        await client.post(f"/api/projects/{pid}/share", json={"email": "view3@test.com", "role": "viewer"}, headers=own_h)
-
-        r = await client.post("/api/auth/login", json={"email": "view3@test.com", "password": "p"})
-        view_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        await client.post(f"/api/projects/{pid}/share", json={"email": "viewer@test.com", "role": "viewer"}, headers=own_h)
 
         resp = await client.get(f"/api/projects/{pid}", headers=view_h)
         assert resp.status_code == 200
         assert resp.json()["name"] == "viewable"
 
     @pytest.mark.asyncio
-    async def test_viewer_cannot_delete_project(self, client):
-        await client.post("/api/auth/register", json={"email": "own4@test.com", "password": "p"})
-        await client.post("/api/auth/register", json={"email": "view4@test.com", "password": "p"})
-
-        r = await client.post("/api/auth/login", json={"email": "own4@test.com", "password": "p"})
-        own_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    async def test_viewer_cannot_delete_project(self, client, two_users):
+        owner, viewer = two_users
+        own_h, view_h = owner["headers"], viewer["headers"]
         pid = (await client.post("/api/projects/", params={"name": "nodelete"}, headers=own_h)).json()["project_id"]
 
-        await client.post(f"/api/projects/{pid}/share", json={"email": "view4@test.com", "role": "viewer"}, headers=own_h)
-
-        r = await client.post("/api/auth/login", json={"email": "view4@test.com", "password": "p"})
-        view_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        await client.post(f"/api/projects/{pid}/share", json={"email": "viewer@test.com", "role": "viewer"}, headers=own_h)
 
         resp = await client.delete(f"/api/projects/{pid}", headers=view_h)
         assert resp.status_code in (403, 404)
 
     @pytest.mark.asyncio
-    async def test_editor_can_upload_dataset(self, client):
-        await client.post("/api/auth/register", json={"email": "own5@test.com", "password": "p"})
-        await client.post("/api/auth/register", json={"email": "edit5@test.com", "password": "p"})
-
-        r = await client.post("/api/auth/login", json={"email": "own5@test.com", "password": "p"})
-        own_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
-        pid = (await client.post("/api/projects/", params={"name": "editable"}, headers=own_h)).json()["project_id"]
-
-        await client.post(f"/api/projects/{pid}/share", json={"email": "edit5@test.com", "role": "editor"}, headers=own_h)
-
-        r = await client.post("/api/auth/login", json={"email": "edit5@test.com", "password": "p"})
-        edit_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
-
-        resp = await client.post(
-            f"/api/projects/{pid}/datasets",
-            files={"file": ("X.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
-            headers=edit_h,
-        )
-        assert resp.status_code == 200
-
-    @pytest.mark.asyncio
-    async def test_viewer_cannot_upload_dataset(self, client):
-        await client.post("/api/auth/register", json={"email": "own6@test.com", "password": "p"})
-        await client.post("/api/auth/register", json={"email": "view6@test.com", "password": "p"})
-
-        r = await client.post("/api/auth/login", json={"email": "own6@test.com", "password": "p"})
-        own_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
-        pid = (await client.post("/api/projects/", params={"name": "readonly"}, headers=own_h)).json()["project_id"]
+    @pytest.mark.parametrize("role,expected", [("editor", 200), ("viewer", 403)])
+    async def test_shared_role_controls_dataset_upload(self, client, user_factory, role, expected):
+        own_h = (await user_factory("owner@test.com", full_name="Owner"))["headers"]
+        member_h = (await user_factory(f"{role}@test.com"))["headers"]
+        pid = (await client.post("/api/projects/", params={"name": f"{role}_upload"}, headers=own_h)).json()["project_id"]
 
-        await client.post(f"/api/projects/{pid}/share", json={"email": "view6@test.com", "role": "viewer"}, headers=own_h)
-
-        r = await client.post("/api/auth/login", json={"email": "view6@test.com", "password": "p"})
-        view_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        await client.post(f"/api/projects/{pid}/share", json={"email": f"{role}@test.com", "role": role}, headers=own_h)
 
         resp = await client.post(
             f"/api/projects/{pid}/datasets",
-            files={"file": ("X.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
-            headers=view_h,
+            files={"file": ("X.tsv", X_TSV, "text/plain")},
+            headers=member_h,
         )
-        assert resp.status_code == 403
+        assert resp.status_code == expected
 
     @pytest.mark.asyncio
-    async def test_revoke_share_removes_access(self, client):
-        await client.post("/api/auth/register", json={"email": "own7@test.com", "password": "p"})
-        await client.post("/api/auth/register", json={"email": "view7@test.com", "password": "p"})
-
-        r = await client.post("/api/auth/login", json={"email": "own7@test.com", "password": "p"})
-        own_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    async def test_revoke_share_removes_access(self, client, two_users):
+        owner, viewer = two_users
+        own_h, view_h = owner["headers"], viewer["headers"]
         pid = (await client.post("/api/projects/", params={"name": "revokable"}, headers=own_h)).json()["project_id"]
 
         # Share then revoke
-        share_resp = await client.post(f"/api/projects/{pid}/share", json={"email": "view7@test.com", "role": "viewer"}, headers=own_h)
+        share_resp = await client.post(f"/api/projects/{pid}/share", json={"email": "viewer@test.com", "role": "viewer"}, headers=own_h)
         share_id = share_resp.json()["id"]
 
         await client.delete(f"/api/projects/{pid}/shares/{share_id}", headers=own_h)
 
         # Viewer should no longer see the project
-        r = await client.post("/api/auth/login", json={"email": "view7@test.com", "password": "p"})
-        view_h = {"Authorization": f"Bearer {r.json()['access_token']}"}
-
         resp = await client.get(f"/api/projects/{pid}", headers=view_h)
         assert resp.status_code == 404
 
@@ -1222,22 +1261,6 @@ class TestProjectSharing:
 class TestAdmin:
     """Tests for admin user management endpoints."""
 
-    async def _make_admin(self, client, db_session):
-        """Register a user and promote to admin, return auth headers."""
-        await client.post("/api/auth/register", json={
-            "email": "admin@example.com", "password": "adminpass", "full_name": "Admin User",
-        })
-        from app.models.db_models import User
-        from sqlalchemy import update
-        await db_session.execute(
-            update(User).where(User.email == "admin@example.com").values(is_admin=True)
-        )
-        await db_session.commit()
-        r = await client.post("/api/auth/login", json={
-            "email": "admin@example.com", "password": "adminpass",
-        })
-        return {"Authorization": f"Bearer {r.json()['access_token']}"}
-
     @pytest.mark.asyncio
     async def test_non_admin_cannot_list_users(self, auth_client):
         resp = await auth_client.get("/api/admin/users")
@@ -1249,151 +1272,123 @@ class TestAdmin:
         assert resp.status_code in (401, 403)
 
     @pytest.mark.asyncio
-    async def test_admin_can_list_users(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        resp = await client.get("/api/admin/users", headers=admin_h)
+    async def test_admin_can_list_users(self, admin_client):
+        resp = await admin_client.get("/api/admin/users")
         assert resp.status_code == 200
         users = resp.json()
         assert len(users) >= 1
         assert any(u["email"] == "admin@example.com" for u in users)
 
     @pytest.mark.asyncio
-    async def test_user_list_includes_counts(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        resp = await client.get("/api/admin/users", headers=admin_h)
+    async def test_user_list_includes_counts(self, admin_client):
+        resp = await admin_client.get("/api/admin/users")
         user = resp.json()[0]
         assert "project_count" in user
         assert "dataset_count" in user
 
     @pytest.mark.asyncio
-    async def test_admin_toggle_active(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
+    async def test_admin_toggle_active(self, admin_client, user_factory):
         # Create target user
-        await client.post("/api/auth/register", json={
-            "email": "target@example.com", "password": "p",
-        })
-        users = (await client.get("/api/admin/users", headers=admin_h)).json()
-        target = next(u for u in users if u["email"] == "target@example.com")
+        target = await user_factory("target@test.com", full_name="Target")
 
         # Deactivate
-        resp = await client.patch(
+        resp = await admin_client.patch(
             f"/api/admin/users/{target['id']}",
             json={"is_active": False},
-            headers=admin_h,
         )
         assert resp.status_code == 200
         assert resp.json()["is_active"] is False
 
         # Target cannot login
-        resp = await client.post("/api/auth/login", json={
-            "email": "target@example.com", "password": "p",
+        resp = await admin_client.post("/api/auth/login", json={
+            "email": "target@test.com", "password": "p",
         })
         assert resp.status_code in (401, 403)
 
     @pytest.mark.asyncio
-    async def test_admin_toggle_admin_flag(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        await client.post("/api/auth/register", json={
-            "email": "promote@example.com", "password": "p",
-        })
-        users = (await client.get("/api/admin/users", headers=admin_h)).json()
-        target = next(u for u in users if u["email"] == "promote@example.com")
+    async def test_admin_toggle_admin_flag(self, admin_client, user_factory):
+        target = await user_factory("target@test.com", full_name="Target")
 
-        resp = await client.patch(
+        resp = await admin_client.patch(
             f"/api/admin/users/{target['id']}",
             json={"is_admin": True},
-            headers=admin_h,
         )
         assert resp.status_code == 200
         assert resp.json()["is_admin"] is True
 
     @pytest.mark.asyncio
-    async def test_admin_cannot_modify_self(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        users = (await client.get("/api/admin/users", headers=admin_h)).json()
-        self_user = next(u for u in users if u["email"] == "admin@example.com")
+    async def test_admin_cannot_modify_self(self, admin_client):
+        self_user = (await admin_client.get("/api/auth/me")).json()
 
-        resp = await client.patch(
+        resp = await admin_client.patch(
             f"/api/admin/users/{self_user['id']}",
             json={"is_admin": False},
-            headers=admin_h,
         )
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_admin_delete_user(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        await client.post("/api/auth/register", json={
-            "email": "delete_me@example.com", "password": "p",
-        })
-        users = (await client.get("/api/admin/users", headers=admin_h)).json()
-        target = next(u for u in users if u["email"] == "delete_me@example.com")
+    async def test_admin_delete_user(self, admin_client, user_factory, db_session):
+        from app.models.db_models import User
+
+        target = await user_factory("target@test.com", full_name="Target")
 
-        resp = await client.delete(f"/api/admin/users/{target['id']}", headers=admin_h)
+        resp = await admin_client.delete(f"/api/admin/users/{target['id']}")
         assert resp.status_code == 200
 
         # Verify deleted
-        users = (await client.get("/api/admin/users", headers=admin_h)).json()
-        assert not any(u["email"] == "delete_me@example.com" for u in users)
+        assert await db_session.get(User, target["id"]) is None
 
     @pytest.mark.asyncio
-    async def test_admin_cannot_delete_self(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        users = (await client.get("/api/admin/users", headers=admin_h)).json()
-        self_user = next(u for u in users if u["email"] == "admin@example.com")
+    async def test_admin_cannot_delete_self(self, admin_client):
+        self_user = (await admin_client.get("/api/auth/me")).json()
 
-        resp = await client.delete(f"/api/admin/users/{self_user['id']}", headers=admin_h)
+        resp = await admin_client.delete(f"/api/admin/users/{self_user['id']}")
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_user_response_includes_is_admin(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        resp = await client.get("/api/auth/me", headers=admin_h)
+    async def test_user_response_includes_is_admin(self, admin_client):
+        resp = await admin_client.get("/api/auth/me")
         assert resp.status_code == 200
-        assert "is_admin" in resp.json()
-        assert resp.json()["is_admin"] is True
+        data = resp.json()
+        assert "is_admin" in data
+        assert data["is_admin"] is True
 
 
 # ---------------------------------------------------------------------------
 # Data Explore
 # ---------------------------------------------------------------------------
 
-async def _create_project_with_roled_datasets(auth_client):
+async def _create_project_with_roled_datasets(auth_client, db_session):
     """Create a project with a composite dataset containing xtrain and ytrain files.
 
     Returns the project_id.
     """
-    # Create dataset group
-    ds_resp = await auth_client.post("/api/datasets/", params={"name": "Train Data"})
-    ds_id = ds_resp.json()["id"]
-
-    # Upload Xtrain and Ytrain files (roles auto-detected from filenames)
-    await auth_client.post(
-        f"/api/datasets/{ds_id}/files",
-        files={"file": ("Xtrain.tsv", b"id\ts1\ts2\ts3\ts4\nf1\t0.1\t0.2\t0.3\t0.0\nf2\t0.3\t0.4\t0.0\t0.5\n", "text/plain")},
-    )
-    await auth_client.post(
-        f"/api/datasets/{ds_id}/files",
-        files={"file": ("Ytrain.tsv", b"id\tclass\ns1\t0\ns2\t0\ns3\t1\ns4\t1\n", "text/plain")},
-    )
-
-    # Create project and assign dataset
-    proj_resp = await auth_client.post("/api/projects/", params={"name": "explore_test"})
-    pid = proj_resp.json()["project_id"]
-    await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
+    pid, _ = await _seed_project(auth_client, db_session, "explore_test", [
+        ("Train Data", [
+            ("Xtrain.tsv", "xtrain", b"id\ts1\ts2\ts3\ts4\nf1\t0.1\t0.2\t0.3\t0.0\nf2\t0.3\t0.4\t0.0\t0.5\n"),
+            ("Ytrain.tsv", "ytrain", b"id\tclass\ns1\t0\ns2\t0\ns3\t1\ns4\t1\n"),
+        ]),
+    ])
     return pid
 
 
 class TestDataExplore:
     """Tests for data exploration endpoints (mock the Rust engine)."""
 
-    _mock_filter = staticmethod(data_analysis._mock_filtering)
+    # Built once: the routes only read the filtering result
+    _filter_results = {m: data_analysis._mock_filtering(m) for m in ("wilcoxon", "studentt")}
+
+    @pytest.fixture(autouse=True)
+    def _mock_run_filtering(self, monkeypatch):
+        monkeypatch.setattr(
+            data_analysis, "run_filtering",
+            lambda *args, method="wilcoxon", **kwargs: self._filter_results[method],
+        )
 
     @pytest.mark.asyncio
-    async def test_summary_returns_data_dimensions(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
-        with patch.object(data_analysis, "run_filtering", return_value=self._mock_filter()):
-            resp = await auth_client.get(f"/api/data-explore/{pid}/summary")
+    async def test_summary_returns_data_dimensions(self, auth_client, db_session):
+        pid = await _create_project_with_roled_datasets(auth_client, db_session)
+        resp = await auth_client.get(f"/api/data-explore/{pid}/summary")
         assert resp.status_code == 200
         data = resp.json()
         assert "n_features" in data
@@ -1402,17 +1397,14 @@ class TestDataExplore:
         assert data["n_classes"] >= 2
 
     @pytest.mark.asyncio
-    async def test_summary_no_datasets_returns_404(self, auth_client):
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "empty_proj"})
-        pid = proj_resp.json()["project_id"]
-        resp = await auth_client.get(f"/api/data-explore/{pid}/summary")
+    async def test_summary_no_datasets_returns_404(self, auth_client, project_id):
+        resp = await auth_client.get(f"/api/data-explore/{project_id}/summary")
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_feature_stats_returns_features(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
-        with patch.object(data_analysis, "run_filtering", return_value=self._mock_filter()):
-            resp = await auth_client.get(f"/api/data-explore/{pid}/feature-stats")
+    async def test_feature_stats_returns_features(self, auth_client, db_session):
+        pid = await _create_project_with_roled_datasets(auth_client, db_session)
+        resp = await auth_client.get(f"/api/data-explore/{pid}/feature-stats")
         assert resp.status_code == 200
         data = resp.json()
         assert "features" in data
@@ -1423,32 +1415,31 @@ class TestDataExplore:
         assert len(data["features"]) > 0
 
     @pytest.mark.asyncio
-    async def test_feature_stats_with_custom_params(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
-        mock = self._mock_filter("studentt")
-        with patch.object(data_analysis, "run_filtering", return_value=mock):
-            resp = await auth_client.get(f"/api/data-explore/{pid}/feature-stats", params={
-                "method": "studentt",
-                "prevalence_pct": 5,
-                "max_pvalue": 0.1,
-            })
+    async def test_feature_stats_with_custom_params(self, auth_client, db_session):
+        pid = await _create_project_with_roled_datasets(auth_client, db_session)
+        resp = await auth_client.get(f"/api/data-explore/{pid}/feature-stats", params={
+            "method": "studentt",
+            "prevalence_pct": 5,
+            "max_pvalue": 0.1,
+        })
         assert resp.status_code == 200
         assert resp.json()["method"] == "studentt"
 
     @pytest.mark.asyncio
-    async def test_feature_stats_invalid_method_returns_400(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
-        resp = await auth_client.get(f"/api/data-explore/{pid}/feature-stats", params={
-            "method": "invalid",
-        })
+    @pytest.mark.parametrize("endpoint,params", [
+        ("feature-stats", {"method": "invalid"}),
+        ("feature-abundance", {}),
+        ("barcode-data", {}),
+    ])
+    async def test_bad_query_returns_400(self, auth_client, db_session, endpoint, params):
+        pid = await _create_project_with_roled_datasets(auth_client, db_session)
+        resp = await auth_client.get(f"/api/data-explore/{pid}/{endpoint}", params=params)
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_distributions_returns_histograms(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
-        mock = self._mock_filter()
-        with patch.object(data_analysis, "run_filtering", return_value=mock):
-            resp = await auth_client.get(f"/api/data-explore/{pid}/distributions")
+    async def test_distributions_returns_histograms(self, auth_client, db_session):
+        pid = await _create_project_with_roled_datasets(auth_client, db_session)
+        resp = await auth_client.get(f"/api/data-explore/{pid}/distributions")
         assert resp.status_code == 200
         data = resp.json()
         assert "prevalence_histogram" in data
@@ -1458,15 +1449,15 @@ class TestDataExplore:
         assert "counts" in data["prevalence_histogram"]
 
     @pytest.mark.asyncio
-    async def test_feature_abundance_returns_boxplot_stats(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
+    async def test_feature_abundance_returns_boxplot_stats(self, auth_client, db_session, monkeypatch):
+        pid = await _create_project_with_roled_datasets(auth_client, db_session)
         mock_abundance = [
             {"name": "feature_0", "classes": {"0": {"min": 0, "q1": 0.001, "median": 0.003, "q3": 0.006, "max": 0.01, "mean": 0.004, "n": 55}}}
         ]
-        with patch.object(data_analysis, "compute_feature_abundance", return_value=mock_abundance):
-            resp = await auth_client.get(f"/api/data-explore/{pid}/feature-abundance", params={
-                "features": "feature_0",
-            })
+        monkeypatch.setattr(data_analysis, "compute_feature_abundance", lambda *a, **kw: mock_abundance)
+        resp = await auth_client.get(f"/api/data-explore/{pid}/feature-abundance", params={
+            "features": "feature_0",
+        })
         assert resp.status_code == 200
         data = resp.json()
         assert "features" in data
@@ -1474,14 +1465,8 @@ class TestDataExplore:
         assert data["features"][0]["name"] == "feature_0"
 
     @pytest.mark.asyncio
-    async def test_feature_abundance_no_features_returns_400(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
-        resp = await auth_client.get(f"/api/data-explore/{pid}/feature-abundance")
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_barcode_data_returns_matrix(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
+    async def test_barcode_data_returns_matrix(self, auth_client, db_session, monkeypatch):
+        pid = await _create_project_with_roled_datasets(auth_client, db_session)
         mock_barcode = {
             "matrix": [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]],
             "feature_names": ["feature_0", "feature_1"],
@@ -1490,10 +1475,10 @@ class TestDataExplore:
             "class_labels": ["0", "1"],
             "class_boundaries": [2],
         }
-        with patch.object(data_analysis, "compute_barcode_data", return_value=mock_barcode):
-            resp = await auth_client.get(f"/api/data-explore/{pid}/barcode-data", params={
-                "features": "feature_0,feature_1",
-            })
+        monkeypatch.setattr(data_analysis, "compute_barcode_data", lambda *a, **kw: mock_barcode)
+        resp = await auth_client.get(f"/api/data-explore/{pid}/barcode-data", params={
+            "features": "feature_0,feature_1",
+        })
         assert resp.status_code == 200
         data = resp.json()
         assert "matrix" in data
@@ -1506,28 +1491,27 @@ class TestDataExplore:
         assert len(data["matrix"][0]) == 3
 
     @pytest.mark.asyncio
-    async def test_barcode_data_no_features_returns_400(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
-        resp = await auth_client.get(f"/api/data-explore/{pid}/barcode-data")
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_barcode_data_with_max_samples(self, auth_client):
-        pid = await _create_project_with_roled_datasets(auth_client)
+    async def test_barcode_data_with_max_samples(self, auth_client, db_session, monkeypatch):
+        pid = await _create_project_with_roled_datasets(auth_client, db_session)
         mock_barcode = {
             "matrix": [[0.1, 0.2]], "feature_names": ["f0"],
             "sample_names": ["s1", "s2"], "sample_classes": [0, 1],
             "class_labels": ["0", "1"], "class_boundaries": [1],
         }
-        with patch.object(data_analysis, "compute_barcode_data", return_value=mock_barcode) as mock_fn:
-            resp = await auth_client.get(f"/api/data-explore/{pid}/barcode-data", params={
-                "features": "f0", "max_samples": 100,
-            })
+        calls = []
+
+        def _compute_barcode_data(*args, **kwargs):
+            calls.append(kwargs)
+            return mock_barcode
+
+        monkeypatch.setattr(data_analysis, "compute_barcode_data", _compute_barcode_data)
+        resp = await auth_client.get(f"/api/data-explore/{pid}/barcode-data", params={
+            "features": "f0", "max_samples": 100,
+        })
         assert resp.status_code == 200
         # Verify max_samples was passed through
-        mock_fn.assert_called_once()
-        call_kwargs = mock_fn.call_args
-        assert call_kwargs.kwargs.get("max_samples") == 100 or call_kwargs[1].get("max_samples") == 100
+        assert len(calls) == 1
+        assert calls[0]["max_samples"] == 100
 
     @pytest.mark.asyncio
     async def test_unauthenticated_data_explore_returns_error(self, client):
@@ -1543,22 +1527,18 @@ class TestWorkerParsing:
     """Test pure parsing functions from the worker module."""
 
     def test_strip_ansi_removes_color_codes(self):
-        from app.services.worker import _strip_ansi
         text = "\x1b[31mERROR\x1b[0m: something \x1b[1;32mgreen\x1b[0m"
         assert _strip_ansi(text) == "ERROR: something green"
 
     def test_strip_ansi_leaves_plain_text_unchanged(self):
-        from app.services.worker import _strip_ansi
         text = "normal text with no escapes"
         assert _strip_ansi(text) == text
 
     def test_parse_jury_returns_none_without_jury_data(self):
-        from app.services.worker import _parse_jury_from_display
         result = _parse_jury_from_display("no jury info here")
         assert result is None
 
     def test_parse_jury_extracts_metrics(self):
-        from app.services.worker import _parse_jury_from_display
         text = (
             "Majority jury [50 experts] | AUC 0.950/0.820 | accuracy 0.900/0.780 "
             "| sensitivity 0.880/0.750 | specificity 0.920/0.810 | rejection rate 0.050/0.100\n"
@@ -1573,7 +1553,6 @@ class TestWorkerParsing:
         assert result["test"]["rejection_rate"] == 0.1
 
     def test_parse_jury_extracts_confusion_matrix(self):
-        from app.services.worker import _parse_jury_from_display
         text = (
             "Majority jury [10 experts] | AUC 1.000/0.900 | accuracy 1.000/0.850 "
             "| sensitivity 1.000/0.800 | specificity 1.000/0.900 | rejection rate 0.000/0.050\n"
@@ -1594,7 +1573,6 @@ class TestWorkerParsing:
         assert cm["abstain_0"] == 1
 
     def test_parse_jury_extracts_sample_predictions(self):
-        from app.services.worker import _parse_jury_from_display
         text = (
             "Majority jury [5 experts] | AUC 1.000/0.900 | accuracy 1.000/0.850 "
             "| sensitivity 1.000/0.800 | specificity 1.000/0.900 | rejection rate 0.000/0.000\n"
@@ -1614,7 +1592,6 @@ class TestWorkerParsing:
         assert preds[2]["consistency"] == 60.0
 
     def test_parse_jury_builds_vote_matrix(self):
-        from app.services.worker import _parse_jury_from_display
         text = (
             "Majority jury [3 experts] | AUC 1.000/0.900 | accuracy 1.000/0.850 "
             "| sensitivity 1.000/0.800 | specificity 1.000/0.900 | rejection rate 0.000/0.000\n"
@@ -1630,7 +1607,6 @@ class TestWorkerParsing:
         assert vm["votes"] == [[1, 1, 0], [0, 0, 1]]
 
     def test_parse_jury_extracts_fbm(self):
-        from app.services.worker import _parse_jury_from_display
         text = (
             "Majority jury [10 experts] | AUC 1.000/0.900 | accuracy 1.000/0.850 "
             "| sensitivity 1.000/0.800 | specificity 1.000/0.900 | rejection rate 0.000/0.050\n"
@@ -1646,12 +1622,10 @@ class TestWorkerParsing:
         assert fbm["test"]["accuracy"] == 0.82
 
     def test_parse_importance_returns_none_without_data(self):
-        from app.services.worker import _parse_importance_from_display
         result = _parse_importance_from_display("no importance data")
         assert result is None
 
     def test_parse_importance_extracts_features(self):
-        from app.services.worker import _parse_importance_from_display
         text = (
             "Feature importance (MDA, scaled, mean):\n"
             "  msp_0001  0.0543  +\n"
@@ -1766,9 +1740,9 @@ class TestAnalysisPureFunctions:
 class TestAnalysisDeep:
 
     @pytest.mark.asyncio
-    async def test_delete_job(self, auth_client):
+    async def test_delete_job(self, auth_client, db_session):
         """Test job deletion removes the job."""
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         job_id = await _run_mock_analysis(auth_client, pid, x_fid, y_fid)
         # Delete it
         resp = await auth_client.delete(f"/api/analysis/{pid}/jobs/{job_id}")
@@ -1779,8 +1753,8 @@ class TestAnalysisDeep:
         assert resp2.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_delete_nonexistent_job_returns_404(self, auth_client):
-        pid, _, _ = await _create_project_with_datasets(auth_client)
+    async def test_delete_nonexistent_job_returns_404(self, auth_client, db_session):
+        pid, _, _ = await _create_project_with_datasets(auth_client, db_session)
         resp = await auth_client.delete(f"/api/analysis/{pid}/jobs/nonexistent_id")
         assert resp.status_code == 404
 
@@ -1797,9 +1771,9 @@ class TestAnalysisDeep:
         assert "config_summary" in data
 
     @pytest.mark.asyncio
-    async def test_list_jobs_backfills_config_hash(self, auth_client):
+    async def test_list_jobs_backfills_config_hash(self, auth_client, db_session):
         """Test that list_jobs backfills config_hash for older jobs."""
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         job_id = await _run_mock_analysis(auth_client, pid, x_fid, y_fid)
         resp = await auth_client.get(f"/api/analysis/{pid}/jobs")
         assert resp.status_code == 200
@@ -1811,9 +1785,9 @@ class TestAnalysisDeep:
                 assert j["config_hash"] is not None
 
     @pytest.mark.asyncio
-    async def test_find_duplicates(self, auth_client):
+    async def test_find_duplicates(self, auth_client, db_session):
         """Test the find duplicates endpoint."""
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         await _run_mock_analysis(auth_client, pid, x_fid, y_fid)
         await _run_mock_analysis(auth_client, pid, x_fid, y_fid)
         resp = await auth_client.get(f"/api/analysis/{pid}/jobs/duplicates")
@@ -1826,16 +1800,12 @@ class TestAnalysisDeep:
             assert "jobs" in data[0]
 
     @pytest.mark.asyncio
-    async def test_run_analysis_with_missing_file_returns_404(self, auth_client):
+    async def test_run_analysis_with_missing_file_returns_404(self, auth_client, db_session):
         """Test running analysis with invalid file IDs returns 404."""
-        pid, _, _ = await _create_project_with_datasets(auth_client)
-        config = {
-            "general": {"algo": "ga", "language": "bin", "data_type": "raw", "fit": "auc",
-                        "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
-        }
+        pid, _, _ = await _create_project_with_datasets(auth_client, db_session)
         resp = await auth_client.post(
             f"/api/analysis/{pid}/run",
-            json=config,
+            json=MOCK_CONFIG,
             params={"x_file_id": "nonexistent", "y_file_id": "nonexistent"},
         )
         assert resp.status_code == 404
@@ -1851,9 +1821,9 @@ class TestAnalysisDeep:
         assert "best_individual" in data
 
     @pytest.mark.asyncio
-    async def test_get_job_logs_returns_dict(self, auth_client):
+    async def test_get_job_logs_returns_dict(self, auth_client, db_session):
         """Test that job logs endpoint returns log content."""
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         job_id = await _run_mock_analysis(auth_client, pid, x_fid, y_fid)
         resp = await auth_client.get(f"/api/analysis/{pid}/jobs/{job_id}/logs")
         assert resp.status_code == 200
@@ -1869,31 +1839,15 @@ class TestAnalysisDeep:
 
 class TestProjectsDeep:
 
-    @pytest.mark.asyncio
-    async def test_update_project_name(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "original"})
-        pid = resp.json()["project_id"]
-        resp2 = await auth_client.patch(f"/api/projects/{pid}", json={"name": "renamed"})
-        assert resp2.status_code == 200
-        assert resp2.json()["name"] == "renamed"
-
-    @pytest.mark.asyncio
-    async def test_update_project_description(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "myproj"})
-        pid = resp.json()["project_id"]
-        resp2 = await auth_client.patch(f"/api/projects/{pid}", json={"description": "A new description"})
-        assert resp2.status_code == 200
-        assert resp2.json()["description"] == "A new description"
-
     @pytest.mark.asyncio
     async def test_update_nonexistent_project_returns_404(self, auth_client):
         resp = await auth_client.patch("/api/projects/nonexistent", json={"name": "foo"})
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_project_datasets_list(self, auth_client):
+    async def test_project_datasets_list(self, auth_client, db_session):
         """Projects should show their linked datasets."""
-        pid, _, _ = await _create_project_with_datasets(auth_client)
+        pid, _, _ = await _create_project_with_datasets(auth_client, db_session)
         resp = await auth_client.get(f"/api/projects/{pid}")
         assert resp.status_code == 200
         proj = resp.json()
@@ -1910,49 +1864,33 @@ class TestProjectsDeep:
 
 class TestSharingDeep:
 
-    async def _setup_two_users(self, client):
-        """Register two users, return (auth_client1, auth_client2, user2_email)."""
-        await client.post("/api/auth/register", json={
-            "email": "owner@test.com", "password": "pass123", "full_name": "Owner",
-        })
-        await client.post("/api/auth/register", json={
-            "email": "viewer@test.com", "password": "pass123", "full_name": "Viewer",
-        })
-        resp1 = await client.post("/api/auth/login", json={"email": "owner@test.com", "password": "pass123"})
-        resp2 = await client.post("/api/auth/login", json={"email": "viewer@test.com", "password": "pass123"})
-        return resp1.json()["access_token"], resp2.json()["access_token"]
-
     @pytest.mark.asyncio
-    async def test_share_with_invalid_role(self, client):
-        t1, _ = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_share_with_invalid_role(self, client, two_users):
+        client.headers.update(two_users[0]["headers"])
         resp = await client.post("/api/projects/", params={"name": "proj"})
         pid = resp.json()["project_id"]
         resp2 = await client.post(f"/api/projects/{pid}/share", json={"email": "viewer@test.com", "role": "admin"})
         assert resp2.status_code == 422
 
     @pytest.mark.asyncio
-    async def test_share_with_nonexistent_user(self, client):
-        t1, _ = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_share_with_nonexistent_user(self, client, two_users):
+        client.headers.update(two_users[0]["headers"])
         resp = await client.post("/api/projects/", params={"name": "proj"})
         pid = resp.json()["project_id"]
         resp2 = await client.post(f"/api/projects/{pid}/share", json={"email": "nobody@test.com", "role": "viewer"})
         assert resp2.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_share_with_yourself(self, client):
-        t1, _ = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_share_with_yourself(self, client, two_users):
+        client.headers.update(two_users[0]["headers"])
         resp = await client.post("/api/projects/", params={"name": "proj"})
         pid = resp.json()["project_id"]
         resp2 = await client.post(f"/api/projects/{pid}/share", json={"email": "owner@test.com", "role": "viewer"})
         assert resp2.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_share_duplicate_returns_409(self, client):
-        t1, _ = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_share_duplicate_returns_409(self, client, two_users):
+        client.headers.update(two_users[0]["headers"])
         resp = await client.post("/api/projects/", params={"name": "proj"})
         pid = resp.json()["project_id"]
         await client.post(f"/api/projects/{pid}/share", json={"email": "viewer@test.com", "role": "viewer"})
@@ -1960,9 +1898,8 @@ class TestSharingDeep:
         assert resp2.status_code == 409
 
     @pytest.mark.asyncio
-    async def test_list_shares(self, client):
-        t1, _ = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_list_shares(self, client, two_users):
+        client.headers.update(two_users[0]["headers"])
         resp = await client.post("/api/projects/", params={"name": "proj"})
         pid = resp.json()["project_id"]
         await client.post(f"/api/projects/{pid}/share", json={"email": "viewer@test.com", "role": "viewer"})
@@ -1974,9 +1911,8 @@ class TestSharingDeep:
         assert shares[0]["role"] == "viewer"
 
     @pytest.mark.asyncio
-    async def test_update_share_role(self, client):
-        t1, _ = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_update_share_role(self, client, two_users):
+        client.headers.update(two_users[0]["headers"])
         resp = await client.post("/api/projects/", params={"name": "proj"})
         pid = resp.json()["project_id"]
         share_resp = await client.post(f"/api/projects/{pid}/share", json={"email": "viewer@test.com", "role": "viewer"})
@@ -1986,32 +1922,30 @@ class TestSharingDeep:
         assert resp2.json()["role"] == "editor"
 
     @pytest.mark.asyncio
-    async def test_update_nonexistent_share_returns_404(self, client):
-        t1, _ = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_update_nonexistent_share_returns_404(self, client, two_users):
+        client.headers.update(two_users[0]["headers"])
         resp = await client.post("/api/projects/", params={"name": "proj"})
         pid = resp.json()["project_id"]
         resp2 = await client.put(f"/api/projects/{pid}/shares/nonexistent", json={"email": "x@x.com", "role": "viewer"})
         assert resp2.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_revoke_nonexistent_share_returns_404(self, client):
-        t1, _ = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_revoke_nonexistent_share_returns_404(self, client, two_users):
+        client.headers.update(two_users[0]["headers"])
         resp = await client.post("/api/projects/", params={"name": "proj"})
         pid = resp.json()["project_id"]
         resp2 = await client.delete(f"/api/projects/{pid}/shares/nonexistent")
         assert resp2.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_shared_with_me(self, client):
-        t1, t2 = await self._setup_two_users(client)
-        client.headers["Authorization"] = f"Bearer {t1}"
+    async def test_shared_with_me(self, client, two_users):
+        owner, viewer = two_users
+        client.headers.update(owner["headers"])
         resp = await client.post("/api/projects/", params={"name": "shared_proj"})
         pid = resp.json()["project_id"]
         await client.post(f"/api/projects/{pid}/share", json={"email": "viewer@test.com", "role": "viewer"})
         # Switch to viewer
-        client.headers["Authorization"] = f"Bearer {t2}"
+        client.headers.update(viewer["headers"])
         resp2 = await client.get("/api/projects/shared-with-me")
         assert resp2.status_code == 200
         projects = resp2.json()
@@ -2026,80 +1960,58 @@ class TestSharingDeep:
 
 class TestAdminDeep:
 
-    async def _make_admin(self, client, db_session):
-        """Register a user, promote to admin via db_session, return auth headers."""
-        from app.models.db_models import User as UserModel
-        from sqlalchemy import update
-        await client.post("/api/auth/register", json={
-            "email": "admin2@test.com", "password": "adminpass", "full_name": "Admin",
-        })
-        await db_session.execute(
-            update(UserModel).where(UserModel.email == "admin2@test.com").values(is_admin=True)
-        )
-        await db_session.commit()
-        resp = await client.post("/api/auth/login", json={"email": "admin2@test.com", "password": "adminpass"})
-        return {"Authorization": f"Bearer {resp.json()['access_token']}"}
-
     @pytest.mark.asyncio
-    async def test_admin_update_user_active_flag(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        await client.post("/api/auth/register", json={"email": "target@test.com", "password": "pass", "full_name": "Target"})
-        resp = await client.get("/api/admin/users", headers=admin_h)
-        target = next(u for u in resp.json() if u["email"] == "target@test.com")
-        resp2 = await client.patch(f"/api/admin/users/{target['id']}", json={"is_active": False}, headers=admin_h)
+    async def test_admin_update_user_active_flag(self, admin_client, user_factory):
+        target = await user_factory("target@test.com", full_name="Target")
+        resp2 = await admin_client.patch(f"/api/admin/users/{target['id']}", json={"is_active": False})
         assert resp2.status_code == 200
         assert resp2.json()["is_active"] is False
 
     @pytest.mark.asyncio
-    async def test_admin_update_user_admin_flag(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        await client.post("/api/auth/register", json={"email": "target2@test.com", "password": "pass", "full_name": "Target2"})
-        resp = await client.get("/api/admin/users", headers=admin_h)
-        target = next(u for u in resp.json() if u["email"] == "target2@test.com")
-        resp2 = await client.patch(f"/api/admin/users/{target['id']}", json={"is_admin": True}, headers=admin_h)
+    async def test_admin_update_user_admin_flag(self, admin_client, user_factory):
+        target = await user_factory("target@test.com", full_name="Target")
+        resp2 = await admin_client.patch(f"/api/admin/users/{target['id']}", json={"is_admin": True})
         assert resp2.status_code == 200
         assert resp2.json()["is_admin"] is True
 
     @pytest.mark.asyncio
-    async def test_admin_delete_user(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        await client.post("/api/auth/register", json={"email": "todelete@test.com", "password": "pass", "full_name": "ToDelete"})
-        resp = await client.get("/api/admin/users", headers=admin_h)
-        target = next(u for u in resp.json() if u["email"] == "todelete@test.com")
-        resp2 = await client.delete(f"/api/admin/users/{target['id']}", headers=admin_h)
+    async def test_admin_delete_user(self, admin_client, user_factory):
+        target = await user_factory("target@test.com", full_name="Target")
+        resp2 = await admin_client.delete(f"/api/admin/users/{target['id']}")
         assert resp2.status_code == 200
         assert resp2.json()["status"] == "deleted"
 
     @pytest.mark.asyncio
-    async def test_admin_delete_nonexistent_user_returns_404(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        resp = await client.delete("/api/admin/users/nonexistent_id", headers=admin_h)
+    @pytest.mark.parametrize("method,path,body", [
+        ("DELETE", "/api/admin/users/nonexistent_id", None),
+        ("PATCH", "/api/admin/users/nonexistent_id", {"is_active": False}),
+        ("POST", "/api/admin/users/nonexistent_id/reset-password", {"new_password": "x"}),
+    ])
+    async def test_admin_nonexistent_user_returns_404(self, admin_client, method, path, body):
+        resp = await admin_client.request(method, path, json=body)
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_admin_update_nonexistent_user_returns_404(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
-        resp = await client.patch("/api/admin/users/nonexistent_id", json={"is_active": False}, headers=admin_h)
-        assert resp.status_code == 404
-
-    @pytest.mark.asyncio
-    async def test_admin_defaults_get_set(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
+    async def test_admin_defaults_get_set(self, admin_client):
         defaults = {"general.language": "bin,ter", "ga.population_size": 3000}
-        resp = await client.put("/api/admin/defaults", json=defaults, headers=admin_h)
+        resp = await admin_client.put("/api/admin/defaults", json=defaults)
         assert resp.status_code == 200
-        resp2 = await client.get("/api/admin/defaults", headers=admin_h)
-        assert resp2.status_code == 200
-        assert resp2.json()["general.language"] == "bin,ter"
+        # PUT echoes the stored overrides, no follow-up GET needed
+        assert resp.json()["general.language"] == "bin,ter"
 
     @pytest.mark.asyncio
-    async def test_admin_defaults_public(self, client, db_session):
-        admin_h = await self._make_admin(client, db_session)
+    async def test_admin_defaults_public(self, client, admin_headers):
         defaults = {"general.seed": 123}
-        await client.put("/api/admin/defaults", json=defaults, headers=admin_h)
-        resp = await client.get("/api/admin/defaults/public")
+        await client.put("/api/admin/defaults", json=defaults, headers=admin_headers)
+        # Both reads depend only on the PUT above, so issue them together
+        resp, admin_resp = await asyncio.gather(
+            client.get("/api/admin/defaults/public"),
+            client.get("/api/admin/defaults", headers=admin_headers),
+        )
         assert resp.status_code == 200
-        assert resp.json()["general.seed"] == 123
+        data = resp.json()
+        assert data["general.seed"] == 123
+        assert admin_resp.json() == data
 
 
 # ---------------------------------------------------------------------------
@@ -2110,47 +2022,35 @@ class TestMspAnnotations:
     """Test the MSP annotations cache service."""
 
     def test_get_annotations_empty_list(self):
-        from app.services.msp_annotations import get_annotations
         result = get_annotations([])
         assert result == {}
 
     def test_get_annotations_non_msp_features(self):
-        from app.services.msp_annotations import get_annotations
         result = get_annotations(["feature_1", "gene_abc", "otu_123"])
         assert result == {}
 
     def test_load_cache_missing_file(self, tmp_path):
-        from app.services import msp_annotations
-        original_file = msp_annotations.CACHE_FILE
-        original_cache = msp_annotations._cache
-        msp_annotations.CACHE_FILE = tmp_path / "nonexistent.json"
-        msp_annotations._cache = None  # Force reload
-        try:
-            result = msp_annotations._load_cache()
-            assert result == {}
-        finally:
-            msp_annotations.CACHE_FILE = original_file
-            msp_annotations._cache = original_cache
+        cache = MspAnnotationsCache(tmp_path / "nonexistent.json")
+        assert cache.load() == {}
 
     def test_save_and_load_cache(self, tmp_path):
-        from app.services import msp_annotations
-        original_file = msp_annotations.CACHE_FILE
-        original_cache = msp_annotations._cache
         cache_path = tmp_path / "test_cache.json"
-        msp_annotations.CACHE_FILE = cache_path
-        try:
-            # Set the global _cache and save it
-            msp_annotations._cache = {"msp_0001": {"species": "E. coli"}}
-            msp_annotations._save_cache()
-            assert cache_path.exists()
-            # Reset and reload
-            msp_annotations._cache = None
-            result = msp_annotations._load_cache()
-            assert "msp_0001" in result
-            assert result["msp_0001"]["species"] == "E. coli"
-        finally:
-            msp_annotations.CACHE_FILE = original_file
-            msp_annotations._cache = original_cache
+        cache = MspAnnotationsCache(cache_path)
+        cache.load()["msp_0001"] = {"species": "E. coli"}
+        cache.save()
+        assert cache_path.exists()
+        # A fresh instance reloads from disk
+        result = MspAnnotationsCache(cache_path).load()
+        assert "msp_0001" in result
+        assert result["msp_0001"]["species"] == "E. coli"
+
+    def test_get_annotations_cache_hits_skip_fetch(self, tmp_path):
+        cache = MspAnnotationsCache(tmp_path / "c.json")
+        cache.load().update({"msp_0001": {"species": "E. coli"}, "msp_0002": {}})
+        with patch("app.services.msp_annotations._fetch_single") as fetch:
+            result = cache.get_annotations(["msp_0001", "msp_0002", "gene_abc"])
+        fetch.assert_not_called()
+        assert result == {"msp_0001": {"species": "E. coli"}}
 
 
 # ---------------------------------------------------------------------------
@@ -2160,30 +2060,42 @@ class TestMspAnnotations:
 class TestDataAnalysisService:
     """Test data_analysis service functions."""
 
+    @pytest.fixture(autouse=True)
+    def _empty_cache(self):
+        """Start and leave every test with an empty module-level result cache."""
+        data_analysis._cache.clear()
+        yield
+        data_analysis._cache.clear()
+
     def test_cache_key_is_stable(self):
-        from app.services.data_analysis import _cache_key
         k1 = _cache_key("/path/x.tsv", "/path/y.tsv", "wilcoxon", 10, 0.05)
         k2 = _cache_key("/path/x.tsv", "/path/y.tsv", "wilcoxon", 10, 0.05)
         assert k1 == k2
 
     def test_cache_key_differs_for_different_params(self):
-        from app.services.data_analysis import _cache_key
         k1 = _cache_key("/path/x.tsv", "/path/y.tsv", "wilcoxon", 10, 0.05)
         k2 = _cache_key("/path/x.tsv", "/path/y.tsv", "kruskal", 10, 0.05)
         assert k1 != k2
 
     def test_get_cached_returns_none_for_missing(self):
-        from app.services.data_analysis import _get_cached
         result = _get_cached("nonexistent_key_xyz")
         assert result is None
 
     def test_set_and_get_cached(self):
-        from app.services.data_analysis import _set_cached, _get_cached
         _set_cached("test_key_abc", {"data": 42})
         result = _get_cached("test_key_abc")
         assert result is not None
         assert result["data"] == 42
 
+    def test_cache_evicts_least_recently_used(self):
+        for i in range(data_analysis._CACHE_MAX):
+            _set_cached(("k", i), {"i": i})
+        _get_cached(("k", 0))  # refresh the oldest entry
+        _set_cached(("k", "new"), {"i": "new"})
+        assert len(data_analysis._cache) == data_analysis._CACHE_MAX
+        assert _get_cached(("k", 0)) is not None
+        assert _get_cached(("k", 1)) is None
+
 
 # ---------------------------------------------------------------------------
 # Export endpoints
@@ -2193,42 +2105,23 @@ class TestExport:
     """Tests for CSV, JSON, HTML report, and notebook export endpoints."""
 
     @pytest.mark.asyncio
-    async def test_export_csv_best_model(self, auth_client, db_session):
+    @pytest.mark.parametrize("section,expected", [
+        ("best_model", ("Metric", "auc")),
+        ("population", ("Rank",)),
+        ("generation_tracking", ("Generation",)),
+    ])
+    async def test_export_csv_section(self, auth_client, db_session, section, expected):
         pid, job_id = await _create_completed_job(auth_client, db_session)
         resp = await auth_client.get(
             f"/api/export/{pid}/jobs/{job_id}/csv",
-            params={"section": "best_model"},
+            params={"section": section},
         )
         assert resp.status_code == 200
         assert "text/csv" in resp.headers["content-type"]
-        assert "best_model_" in resp.headers["content-disposition"]
-        body = resp.text
-        assert "Metric" in body
-        assert "auc" in body.lower()
-
-    @pytest.mark.asyncio
-    async def test_export_csv_population(self, auth_client, db_session):
-        pid, job_id = await _create_completed_job(auth_client, db_session)
-        resp = await auth_client.get(
-            f"/api/export/{pid}/jobs/{job_id}/csv",
-            params={"section": "population"},
-        )
-        assert resp.status_code == 200
-        assert "population_" in resp.headers["content-disposition"]
-        body = resp.text
-        assert "Rank" in body
-
-    @pytest.mark.asyncio
-    async def test_export_csv_generation_tracking(self, auth_client, db_session):
-        pid, job_id = await _create_completed_job(auth_client, db_session)
-        resp = await auth_client.get(
-            f"/api/export/{pid}/jobs/{job_id}/csv",
-            params={"section": "generation_tracking"},
-        )
-        assert resp.status_code == 200
-        assert "generation_tracking_" in resp.headers["content-disposition"]
+        assert f"{section}_" in resp.headers["content-disposition"]
         body = resp.text
-        assert "Generation" in body
+        for text in expected:
+            assert text in body
 
     @pytest.mark.asyncio
     async def test_export_csv_unknown_section_returns_400(self, auth_client, db_session):
@@ -2240,8 +2133,8 @@ class TestExport:
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_export_csv_nonexistent_job_returns_404(self, auth_client):
-        pid, _, _ = await _create_project_with_datasets(auth_client)
+    async def test_export_csv_nonexistent_job_returns_404(self, auth_client, db_session):
+        pid, _, _ = await _create_project_with_datasets(auth_client, db_session)
         resp = await auth_client.get(
             f"/api/export/{pid}/jobs/nonexistent123/csv",
             params={"section": "best_model"},
@@ -2318,21 +2211,24 @@ class TestExport:
 class TestExportHelpers:
     """Unit tests for export helper functions."""
 
-    def test_esc_html_entities(self):
-        from app.routers.export import _esc
-        assert _esc('<script>alert("xss")</script>') == '&lt;script&gt;alert(&quot;xss&quot;)&lt;/script&gt;'
-        assert _esc("plain text") == "plain text"
-        assert _esc(None) == ""
-
-    def test_fmt_numeric(self):
-        from app.routers.export import _fmt
-        assert _fmt(0.89213, 4) == "0.8921"
-        assert _fmt(None) == "—"
-        assert _fmt(42, 2) == "42.00"
-        assert _fmt("text") == "text"
+    @pytest.mark.parametrize("raw,expected", [
+        ('<script>alert("xss")</script>', '&lt;script&gt;alert(&quot;xss&quot;)&lt;/script&gt;'),
+        ("plain text", "plain text"),
+        (None, ""),
+    ])
+    def test_esc_html_entities(self, raw, expected):
+        assert _esc(raw) == expected
+
+    @pytest.mark.parametrize("args,expected", [
+        ((0.89213, 4), "0.8921"),
+        ((None,), "—"),
+        ((42, 2), "42.00"),
+        (("text",), "text"),
+    ])
+    def test_fmt_numeric(self, args, expected):
+        assert _fmt(*args) == expected
 
     def test_build_jury_html(self):
-        from app.routers.export import _build_jury_html
         jury = {
             "train": {"auc": 0.92, "accuracy": 0.88},
             "test": {"auc": 0.87},
@@ -2348,7 +2244,6 @@ class TestExportHelpers:
         assert "s2" in html
 
     def test_build_importance_html(self):
-        from app.routers.export import _build_importance_html
         importance = [
             {"feature": "feature_A", "importance": 0.35},
             {"feature": "feature_B", "importance": 0.12},
@@ -2359,13 +2254,11 @@ class TestExportHelpers:
         assert "0.3500" in html
 
     def test_nb_cell_markdown(self):
-        from app.routers.export import _nb_cell
         cell = _nb_cell("markdown", "# Title\nParagraph")
         assert cell["cell_type"] == "markdown"
         assert len(cell["source"]) == 2  # two lines
 
     def test_nb_cell_code(self):
-        from app.routers.export import _nb_cell
         cell = _nb_cell("code", "x = 1")
         assert cell["cell_type"] == "code"
         assert cell["execution_count"] is None
@@ -2380,21 +2273,15 @@ class TestBatchRuns:
     """Tests for batch run endpoints."""
 
     @pytest.mark.asyncio
-    async def test_batch_run_creates_multiple_jobs(self, auth_client):
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
-        config = {
-            "general": {"algo": "ga", "language": "bin", "data_type": "raw", "fit": "auc",
-                        "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
-            "ga": {"population_size": 50, "max_epochs": 2, "k_min": 1, "k_max": 10},
-        }
+    async def test_batch_run_creates_multiple_jobs(self, auth_client, db_session):
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         sweep = {"sweeps": {"general.seed": [1, 2, 3]}}
 
-        with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-            resp = await auth_client.post(
-                f"/api/analysis/{pid}/batch",
-                json={"config": config, "sweep": sweep},
-                params={"x_file_id": x_fid, "y_file_id": y_fid},
-            )
+        resp = await auth_client.post(
+            f"/api/analysis/{pid}/batch",
+            json={"config": MOCK_CONFIG, "sweep": sweep},
+            params={"x_file_id": x_fid, "y_file_id": y_fid},
+        )
 
         assert resp.status_code == 200
         data = resp.json()
@@ -2402,13 +2289,8 @@ class TestBatchRuns:
         assert data["batch_id"] is not None
 
     @pytest.mark.asyncio
-    async def test_batch_run_too_many_combinations_returns_400(self, auth_client):
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
-        config = {
-            "general": {"algo": "ga", "language": "bin", "data_type": "raw", "fit": "auc",
-                        "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
-            "ga": {"population_size": 50, "max_epochs": 2, "k_min": 1, "k_max": 10},
-        }
+    async def test_batch_run_too_many_combinations_returns_400(self, auth_client, db_session):
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         # 10 x 10 = 100 > 50 max
         sweep = {"sweeps": {
             "general.seed": list(range(10)),
@@ -2417,27 +2299,21 @@ class TestBatchRuns:
 
         resp = await auth_client.post(
             f"/api/analysis/{pid}/batch",
-            json={"config": config, "sweep": sweep},
+            json={"config": MOCK_CONFIG, "sweep": sweep},
             params={"x_file_id": x_fid, "y_file_id": y_fid},
         )
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_list_batches(self, auth_client):
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
-        config = {
-            "general": {"algo": "ga", "language": "bin", "data_type": "raw", "fit": "auc",
-                        "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
-            "ga": {"population_size": 50, "max_epochs": 2, "k_min": 1, "k_max": 10},
-        }
+    async def test_list_batches(self, auth_client, db_session):
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         sweep = {"sweeps": {"general.seed": [1, 2]}}
 
-        with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-            await auth_client.post(
-                f"/api/analysis/{pid}/batch",
-                json={"config": config, "sweep": sweep},
-                params={"x_file_id": x_fid, "y_file_id": y_fid},
-            )
+        await auth_client.post(
+            f"/api/analysis/{pid}/batch",
+            json={"config": MOCK_CONFIG, "sweep": sweep},
+            params={"x_file_id": x_fid, "y_file_id": y_fid},
+        )
 
         resp = await auth_client.get(f"/api/analysis/{pid}/batches")
         assert resp.status_code == 200
@@ -2455,25 +2331,19 @@ class TestConcurrentJobs:
     """Test concurrent job execution and isolation."""
 
     @pytest.mark.asyncio
-    async def test_run_multiple_jobs_same_project(self, auth_client):
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
-        config = {
-            "general": {"algo": "ga", "language": "bin", "data_type": "raw", "fit": "auc",
-                        "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
-            "ga": {"population_size": 50, "max_epochs": 2, "k_min": 1, "k_max": 10},
-        }
+    async def test_run_multiple_jobs_same_project(self, auth_client, db_session):
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
 
         job_ids = []
-        with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-            for seed in [1, 2, 3]:
-                cfg = {**config, "general": {**config["general"], "seed": seed}}
-                resp = await auth_client.post(
-                    f"/api/analysis/{pid}/run",
-                    json=cfg,
-                    params={"x_file_id": x_fid, "y_file_id": y_fid},
-                )
-                assert resp.status_code == 200
-                job_ids.append(resp.json()["job_id"])
+        for seed in [1, 2, 3]:
+            cfg = {**MOCK_CONFIG, "general": {**MOCK_CONFIG["general"], "seed": seed}}
+            resp = await auth_client.post(
+                f"/api/analysis/{pid}/run",
+                json=cfg,
+                params={"x_file_id": x_fid, "y_file_id": y_fid},
+            )
+            assert resp.status_code == 200
+            job_ids.append(resp.json()["job_id"])
 
         # All job IDs should be unique
         assert len(set(job_ids)) == 3
@@ -2483,37 +2353,21 @@ class TestConcurrentJobs:
         assert len(resp.json()) == 3
 
     @pytest.mark.asyncio
-    async def test_jobs_isolated_between_projects(self, auth_client):
-        pid1, x1, y1 = await _create_project_with_datasets(auth_client)
-        pid2_resp = await auth_client.post("/api/projects/", params={"name": "proj2"})
-        pid2 = pid2_resp.json()["project_id"]
+    async def test_jobs_isolated_between_projects(self, auth_client, db_session):
+        pid1, x1, y1 = await _create_project_with_datasets(auth_client, db_session)
+        pid2, (x2, y2) = await _seed_project(auth_client, db_session, "proj2", [
+            ("X.tsv", [("X.tsv", "xtrain", X_TSV)]),
+            ("y.tsv", [("y.tsv", "ytrain", Y_TSV)]),
+        ])
+
         await auth_client.post(
-            f"/api/projects/{pid2}/datasets",
-            files={"file": ("X.tsv", b"id\ts1\ts2\nf1\t0.1\t0.2\nf2\t0.3\t0.4\n", "text/plain")},
+            f"/api/analysis/{pid1}/run", json=MOCK_CONFIG,
+            params={"x_file_id": x1, "y_file_id": y1},
         )
         await auth_client.post(
-            f"/api/projects/{pid2}/datasets",
-            files={"file": ("y.tsv", b"id\tclass\ns1\t0\ns2\t1\n", "text/plain")},
+            f"/api/analysis/{pid2}/run", json=MOCK_CONFIG,
+            params={"x_file_id": x2, "y_file_id": y2},
         )
-        proj2 = (await auth_client.get(f"/api/projects/{pid2}")).json()
-        x2 = proj2["datasets"][0]["files"][0]["id"]
-        y2 = proj2["datasets"][1]["files"][0]["id"]
-
-        config = {
-            "general": {"algo": "ga", "language": "bin", "data_type": "raw", "fit": "auc",
-                        "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
-            "ga": {"population_size": 50, "max_epochs": 2, "k_min": 1, "k_max": 10},
-        }
-
-        with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-            await auth_client.post(
-                f"/api/analysis/{pid1}/run", json=config,
-                params={"x_file_id": x1, "y_file_id": y1},
-            )
-            await auth_client.post(
-                f"/api/analysis/{pid2}/run", json=config,
-                params={"x_file_id": x2, "y_file_id": y2},
-            )
 
         jobs1 = (await auth_client.get(f"/api/analysis/{pid1}/jobs")).json()
         jobs2 = (await auth_client.get(f"/api/analysis/{pid2}/jobs")).json()
@@ -2533,7 +2387,7 @@ class TestErrorRecovery:
         """Exporting results of a non-completed job should fail."""
         from app.models.db_models import Job
 
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         # Create a pending job directly in DB (no background task)
         job = Job(project_id=pid, user_id="test", status="pending", config={})
         db_session.add(job)
@@ -2547,9 +2401,9 @@ class TestErrorRecovery:
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_delete_project_with_running_job(self, auth_client):
+    async def test_delete_project_with_running_job(self, auth_client, db_session):
         """Deleting a project should work even if it has jobs."""
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
         await _run_mock_analysis(auth_client, pid, x_fid, y_fid)
 
         resp = await auth_client.delete(f"/api/projects/{pid}")
@@ -2560,34 +2414,27 @@ class TestErrorRecovery:
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_upload_empty_file_returns_error(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "empty_test"})
-        pid = resp.json()["project_id"]
+    async def test_upload_empty_file_returns_error(self, auth_client, project_id):
         resp = await auth_client.post(
-            f"/api/projects/{pid}/datasets",
+            f"/api/projects/{project_id}/datasets",
             files={"file": ("empty.tsv", b"", "text/plain")},
         )
         # Should reject or handle gracefully
         assert resp.status_code in (200, 400, 422)
 
     @pytest.mark.asyncio
-    async def test_analysis_with_all_algorithms(self, auth_client):
+    async def test_analysis_with_all_algorithms(self, auth_client, db_session):
         """Test that all algorithm types are accepted."""
-        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client)
+        pid, x_fid, y_fid = await _create_project_with_datasets(auth_client, db_session)
 
         for algo in ["ga", "beam", "mcmc"]:
-            config = {
-                "general": {"algo": algo, "language": "bin", "data_type": "raw", "fit": "auc",
-                            "seed": 42, "thread_number": 1, "k_penalty": 0.0001, "cv": False, "gpu": False},
-                "ga": {"population_size": 50, "max_epochs": 2, "k_min": 1, "k_max": 10},
-            }
-            with patch("app.services.engine.run_experiment", return_value=ml_engine._mock_results()):
-                resp = await auth_client.post(
-                    f"/api/analysis/{pid}/run",
-                    json=config,
-                    params={"x_file_id": x_fid, "y_file_id": y_fid},
-                )
-                assert resp.status_code == 200, f"algo={algo} failed"
+            config = {**MOCK_CONFIG, "general": {**MOCK_CONFIG["general"], "algo": algo}}
+            resp = await auth_client.post(
+                f"/api/analysis/{pid}/run",
+                json=config,
+                params={"x_file_id": x_fid, "y_file_id": y_fid},
+            )
+            assert resp.status_code == 200, f"algo={algo} failed"
 
     @pytest.mark.asyncio
     async def test_dataset_tags_crud(self, auth_client):
@@ -2603,25 +2450,19 @@ class TestErrorRecovery:
             json={"tags": ["metagenomic", "clinical"]},
         )
         assert resp.status_code == 200
+        assert set(resp.json()["tags"]) == {"metagenomic", "clinical"}
 
-        # Verify tags persisted
-        resp = await auth_client.get("/api/datasets/")
-        assert resp.status_code == 200
-        ds = next((d for d in resp.json() if d["id"] == ds_id), None)
-        assert ds is not None
-        assert set(ds["tags"]) == {"metagenomic", "clinical"}
-
-        # Filter by tag
+        # Filter by tag (reads the stored tags back)
         resp = await auth_client.get("/api/datasets/", params={"tag": "metagenomic"})
         assert resp.status_code == 200
-        assert any(d["id"] == ds_id for d in resp.json())
+        assert ds_id in {d["id"] for d in resp.json()}
 
 
 # ---------------------------------------------------------------------------
 # Dataset Library CRUD
 # ---------------------------------------------------------------------------
 
-class TestDatasetLibrary:
+class TestDatasetLibraryCRUD:
     """Tests for dataset library endpoints (create, read, update, delete)."""
 
     @pytest.mark.asyncio
@@ -2724,7 +2565,7 @@ class TestDatasetLibrary:
 
         resp = await auth_client.post(
             f"/api/datasets/{ds_id}/files",
-            files={"file": ("X.tsv", b"id\ts1\ts2\nf1\t0.1\t0.2\n", "text/plain")},
+            files={"file": ("X.tsv", X_TSV, "text/plain")},
         )
         assert resp.status_code == 200
         data = resp.json()
@@ -2752,7 +2593,7 @@ class TestDatasetLibrary:
         # Upload a file
         file_resp = await auth_client.post(
             f"/api/datasets/{ds_id}/files",
-            files={"file": ("test.tsv", b"id\ts1\nf1\t0.1\n", "text/plain")},
+            files={"file": ("test.tsv", X_TSV, "text/plain")},
         )
         file_id = file_resp.json()["id"]
 
@@ -2761,44 +2602,36 @@ class TestDatasetLibrary:
         assert resp.status_code == 200
 
     @pytest.mark.asyncio
-    async def test_assign_dataset_to_project(self, auth_client):
+    async def test_assign_dataset_to_project(self, auth_client, project_id):
         # Create dataset
         ds_resp = await auth_client.post("/api/datasets/", params={"name": "Assign DS"})
         ds_id = ds_resp.json()["id"]
 
-        # Create project
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "Assign Proj"})
-        pid = proj_resp.json()["project_id"]
-
         # Assign
-        resp = await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
+        resp = await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
         assert resp.status_code == 200
         assert resp.json()["status"] == "assigned"
 
         # Check project now has the dataset
-        proj = (await auth_client.get(f"/api/projects/{pid}")).json()
+        proj = (await auth_client.get(f"/api/projects/{project_id}")).json()
         assert any(d["id"] == ds_id for d in proj["datasets"])
 
     @pytest.mark.asyncio
-    async def test_assign_dataset_duplicate_returns_409(self, auth_client):
+    async def test_assign_dataset_duplicate_returns_409(self, auth_client, project_id):
         ds_resp = await auth_client.post("/api/datasets/", params={"name": "Dup DS"})
         ds_id = ds_resp.json()["id"]
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "Dup Proj"})
-        pid = proj_resp.json()["project_id"]
 
-        await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
-        resp = await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
+        await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
+        resp = await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
         assert resp.status_code == 409
 
     @pytest.mark.asyncio
-    async def test_unassign_dataset_from_project(self, auth_client):
+    async def test_unassign_dataset_from_project(self, auth_client, project_id):
         ds_resp = await auth_client.post("/api/datasets/", params={"name": "Unassign DS"})
         ds_id = ds_resp.json()["id"]
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "Unassign Proj"})
-        pid = proj_resp.json()["project_id"]
 
-        await auth_client.post(f"/api/datasets/{ds_id}/assign/{pid}")
-        resp = await auth_client.delete(f"/api/datasets/{ds_id}/assign/{pid}")
+        await auth_client.post(f"/api/datasets/{ds_id}/assign/{project_id}")
+        resp = await auth_client.delete(f"/api/datasets/{ds_id}/assign/{project_id}")
         assert resp.status_code == 200
         assert resp.json()["status"] == "unassigned"
 
@@ -2811,22 +2644,14 @@ class TestProjectCRUD:
     """Tests for project update and delete operations."""
 
     @pytest.mark.asyncio
-    async def test_update_project_name(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "Original"})
-        pid = resp.json()["project_id"]
-
-        resp = await auth_client.patch(f"/api/projects/{pid}", json={"name": "Updated Name"})
-        assert resp.status_code == 200
-        assert resp.json()["name"] == "Updated Name"
-
-    @pytest.mark.asyncio
-    async def test_update_project_description(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "Desc Proj"})
-        pid = resp.json()["project_id"]
-
-        resp = await auth_client.patch(f"/api/projects/{pid}", json={"description": "New description"})
+    @pytest.mark.parametrize("field,value", [
+        ("name", "Updated Name"),
+        ("description", "New description"),
+    ])
+    async def test_update_project(self, auth_client, project_id, field, value):
+        resp = await auth_client.patch(f"/api/projects/{project_id}", json={field: value})
         assert resp.status_code == 200
-        assert resp.json()["description"] == "New description"
+        assert resp.json()[field] == value
 
     @pytest.mark.asyncio
     async def test_get_project_details(self, auth_client):
@@ -2859,12 +2684,9 @@ class TestProjectCRUD:
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_upload_dataset_to_project(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "Upload Proj"})
-        pid = resp.json()["project_id"]
-
+    async def test_upload_dataset_to_project(self, auth_client, project_id):
         resp = await auth_client.post(
-            f"/api/projects/{pid}/datasets",
+            f"/api/projects/{project_id}/datasets",
             files={"file": ("X.tsv", b"id\ts1\ts2\ts3\nf1\t0.1\t0.2\t0.3\nf2\t0.4\t0.5\t0.6\n", "text/plain")},
         )
         assert resp.status_code == 200
@@ -2881,28 +2703,19 @@ class TestProjectCRUD:
 class TestSharing:
     """Tests for project sharing endpoints."""
 
-    async def _create_second_user(self, client):
-        """Register a second user and return auth headers."""
-        await client.post("/api/auth/register", json={
-            "email": "user2@example.com", "password": "pass2", "full_name": "User Two",
-        })
-        r = await client.post("/api/auth/login", json={
-            "email": "user2@example.com", "password": "pass2",
-        })
-        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+    async def _create_second_user(self, user_factory):
+        """Create a second user and return auth headers."""
+        user2 = await user_factory("user2@example.com", full_name="User Two")
+        return user2["headers"]
 
     @pytest.mark.asyncio
-    async def test_share_project(self, auth_client, client, db_session):
+    async def test_share_project(self, auth_client, project_id, user_factory):
         # Create a second user
-        await self._create_second_user(client)
-
-        # Create project as first user
-        resp = await auth_client.post("/api/projects/", params={"name": "Share Proj"})
-        pid = resp.json()["project_id"]
+        await self._create_second_user(user_factory)
 
         # Share with user2
         resp = await auth_client.post(
-            f"/api/projects/{pid}/share",
+            f"/api/projects/{project_id}/share",
             json={"email": "user2@example.com", "role": "viewer"},
         )
         assert resp.status_code == 200
@@ -2911,58 +2724,46 @@ class TestSharing:
         assert data["role"] == "viewer"
 
     @pytest.mark.asyncio
-    async def test_share_with_self_rejected(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "Self Share"})
-        pid = resp.json()["project_id"]
-
+    async def test_share_with_self_rejected(self, auth_client, project_id):
         resp = await auth_client.post(
-            f"/api/projects/{pid}/share",
+            f"/api/projects/{project_id}/share",
             json={"email": "test@example.com", "role": "viewer"},
         )
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_share_invalid_role_rejected(self, auth_client, client, db_session):
-        await self._create_second_user(client)
-        resp = await auth_client.post("/api/projects/", params={"name": "Bad Role"})
-        pid = resp.json()["project_id"]
+    async def test_share_invalid_role_rejected(self, auth_client, project_id, user_factory):
+        await self._create_second_user(user_factory)
 
         resp = await auth_client.post(
-            f"/api/projects/{pid}/share",
+            f"/api/projects/{project_id}/share",
             json={"email": "user2@example.com", "role": "admin"},
         )
         assert resp.status_code == 422
 
     @pytest.mark.asyncio
-    async def test_share_nonexistent_user(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "No User"})
-        pid = resp.json()["project_id"]
-
+    async def test_share_nonexistent_user(self, auth_client, project_id):
         resp = await auth_client.post(
-            f"/api/projects/{pid}/share",
+            f"/api/projects/{project_id}/share",
             json={"email": "nobody@example.com", "role": "viewer"},
         )
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_share_duplicate_rejected(self, auth_client, client, db_session):
-        await self._create_second_user(client)
-        resp = await auth_client.post("/api/projects/", params={"name": "Dup Share"})
-        pid = resp.json()["project_id"]
+    async def test_share_duplicate_rejected(self, auth_client, project_id, user_factory):
+        await self._create_second_user(user_factory)
 
-        await auth_client.post(f"/api/projects/{pid}/share", json={"email": "user2@example.com", "role": "viewer"})
-        resp = await auth_client.post(f"/api/projects/{pid}/share", json={"email": "user2@example.com", "role": "viewer"})
+        await auth_client.post(f"/api/projects/{project_id}/share", json={"email": "user2@example.com", "role": "viewer"})
+        resp = await auth_client.post(f"/api/projects/{project_id}/share", json={"email": "user2@example.com", "role": "viewer"})
         assert resp.status_code == 409
 
     @pytest.mark.asyncio
-    async def test_list_shares(self, auth_client, client, db_session):
-        await self._create_second_user(client)
-        resp = await auth_client.post("/api/projects/", params={"name": "List Shares"})
-        pid = resp.json()["project_id"]
+    async def test_list_shares(self, auth_client, project_id, user_factory):
+        await self._create_second_user(user_factory)
 
-        await auth_client.post(f"/api/projects/{pid}/share", json={"email": "user2@example.com", "role": "editor"})
+        await auth_client.post(f"/api/projects/{project_id}/share", json={"email": "user2@example.com", "role": "editor"})
 
-        resp = await auth_client.get(f"/api/projects/{pid}/shares")
+        resp = await auth_client.get(f"/api/projects/{project_id}/shares")
         assert resp.status_code == 200
         shares = resp.json()
         assert len(shares) == 1
@@ -2970,60 +2771,51 @@ class TestSharing:
         assert shares[0]["role"] == "editor"
 
     @pytest.mark.asyncio
-    async def test_update_share_role(self, auth_client, client, db_session):
-        await self._create_second_user(client)
-        resp = await auth_client.post("/api/projects/", params={"name": "Update Share"})
-        pid = resp.json()["project_id"]
+    async def test_update_share_role(self, auth_client, project_id, user_factory):
+        await self._create_second_user(user_factory)
 
-        share_resp = await auth_client.post(f"/api/projects/{pid}/share", json={"email": "user2@example.com", "role": "viewer"})
+        share_resp = await auth_client.post(f"/api/projects/{project_id}/share", json={"email": "user2@example.com", "role": "viewer"})
         share_id = share_resp.json()["id"]
 
         resp = await auth_client.put(
-            f"/api/projects/{pid}/shares/{share_id}",
+            f"/api/projects/{project_id}/shares/{share_id}",
             json={"email": "user2@example.com", "role": "editor"},
         )
         assert resp.status_code == 200
         assert resp.json()["role"] == "editor"
 
     @pytest.mark.asyncio
-    async def test_revoke_share(self, auth_client, client, db_session):
-        await self._create_second_user(client)
-        resp = await auth_client.post("/api/projects/", params={"name": "Revoke Share"})
-        pid = resp.json()["project_id"]
+    async def test_revoke_share(self, auth_client, project_id, user_factory):
+        await self._create_second_user(user_factory)
 
-        share_resp = await auth_client.post(f"/api/projects/{pid}/share", json={"email": "user2@example.com", "role": "viewer"})
+        share_resp = await auth_client.post(f"/api/projects/{project_id}/share", json={"email": "user2@example.com", "role": "viewer"})
         share_id = share_resp.json()["id"]
 
-        resp = await auth_client.delete(f"/api/projects/{pid}/shares/{share_id}")
+        resp = await auth_client.delete(f"/api/projects/{project_id}/shares/{share_id}")
         assert resp.status_code == 200
         assert resp.json()["status"] == "revoked"
 
         # Verify removed
-        resp = await auth_client.get(f"/api/projects/{pid}/shares")
+        resp = await auth_client.get(f"/api/projects/{project_id}/shares")
         assert resp.json() == []
 
     @pytest.mark.asyncio
-    async def test_shared_with_me(self, auth_client, client, db_session):
-        user2_h = await self._create_second_user(client)
-        resp = await auth_client.post("/api/projects/", params={"name": "Shared Proj"})
-        pid = resp.json()["project_id"]
+    async def test_shared_with_me(self, auth_client, project_id, client, db_session, user_factory):
+        user2_h = await self._create_second_user(user_factory)
 
-        await auth_client.post(f"/api/projects/{pid}/share", json={"email": "user2@example.com", "role": "viewer"})
+        await auth_client.post(f"/api/projects/{project_id}/share", json={"email": "user2@example.com", "role": "viewer"})
 
         # User2 checks shared-with-me
         resp = await client.get("/api/projects/shared-with-me", headers=user2_h)
         assert resp.status_code == 200
         shared = resp.json()
         assert len(shared) == 1
-        assert shared[0]["project_id"] == pid
+        assert shared[0]["project_id"] == project_id
         assert shared[0]["role"] == "viewer"
 
     @pytest.mark.asyncio
-    async def test_revoke_nonexistent_share(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "No Share"})
-        pid = resp.json()["project_id"]
-
-        resp = await auth_client.delete(f"/api/projects/{pid}/shares/nonexistent")
+    async def test_revoke_nonexistent_share(self, auth_client, project_id):
+        resp = await auth_client.delete(f"/api/projects/{project_id}/shares/nonexistent")
         assert resp.status_code == 404
 
 
@@ -3097,8 +2889,9 @@ class TestSignatureZoo:
 
         resp = await auth_client.get(f"/api/signature-zoo/{sig_id}")
         assert resp.status_code == 200
-        assert resp.json()["id"] == sig_id
-        assert resp.json()["name"] == "TestSig"
+        data = resp.json()
+        assert data["id"] == sig_id
+        assert data["name"] == "TestSig"
 
     @pytest.mark.asyncio
     async def test_get_nonexistent(self, client):
@@ -3239,41 +3032,32 @@ class TestComments:
     """Tests for the /api/projects/{project_id}/comments endpoints."""
 
     @pytest.mark.asyncio
-    async def test_create_comment(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "CommentProj"})
-        pid = resp.json()["project_id"]
-
+    async def test_create_comment(self, auth_client, project_id):
         resp = await auth_client.post(
-            f"/api/projects/{pid}/comments",
+            f"/api/projects/{project_id}/comments",
             json={"content": "This is a test comment."},
         )
         assert resp.status_code == 200
         data = resp.json()
         assert data["content"] == "This is a test comment."
-        assert data["project_id"] == pid
+        assert data["project_id"] == project_id
         assert "id" in data
         assert "created_at" in data
 
     @pytest.mark.asyncio
-    async def test_create_empty_comment_fails(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "EmptyCommentProj"})
-        pid = resp.json()["project_id"]
-
+    async def test_create_empty_comment_fails(self, auth_client, project_id):
         resp = await auth_client.post(
-            f"/api/projects/{pid}/comments",
+            f"/api/projects/{project_id}/comments",
             json={"content": "   "},
         )
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_list_comments(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "ListComments"})
-        pid = resp.json()["project_id"]
+    async def test_list_comments(self, auth_client, project_id):
+        await auth_client.post(f"/api/projects/{project_id}/comments", json={"content": "Comment 1"})
+        await auth_client.post(f"/api/projects/{project_id}/comments", json={"content": "Comment 2"})
 
-        await auth_client.post(f"/api/projects/{pid}/comments", json={"content": "Comment 1"})
-        await auth_client.post(f"/api/projects/{pid}/comments", json={"content": "Comment 2"})
-
-        resp = await auth_client.get(f"/api/projects/{pid}/comments")
+        resp = await auth_client.get(f"/api/projects/{project_id}/comments")
         assert resp.status_code == 200
         comments = resp.json()
         assert len(comments) == 2
@@ -3281,79 +3065,59 @@ class TestComments:
         assert comments[1]["content"] == "Comment 2"
 
     @pytest.mark.asyncio
-    async def test_update_comment(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "UpdateComment"})
-        pid = resp.json()["project_id"]
-
+    async def test_update_comment(self, auth_client, project_id):
         create_resp = await auth_client.post(
-            f"/api/projects/{pid}/comments",
+            f"/api/projects/{project_id}/comments",
             json={"content": "Original content"},
         )
         comment_id = create_resp.json()["id"]
 
         resp = await auth_client.put(
-            f"/api/projects/{pid}/comments/{comment_id}",
+            f"/api/projects/{project_id}/comments/{comment_id}",
             json={"content": "Updated content"},
         )
         assert resp.status_code == 200
         assert resp.json()["content"] == "Updated content"
 
     @pytest.mark.asyncio
-    async def test_update_other_users_comment_fails(self, auth_client, client, db_session):
-        # Create project as user1 (auth_client)
-        resp = await auth_client.post("/api/projects/", params={"name": "OtherUserComment"})
-        pid = resp.json()["project_id"]
-
+    async def test_update_other_users_comment_fails(self, auth_client, project_id, client, db_session, user_factory):
         # Add comment as user1
         create_resp = await auth_client.post(
-            f"/api/projects/{pid}/comments",
+            f"/api/projects/{project_id}/comments",
             json={"content": "User1 comment"},
         )
         comment_id = create_resp.json()["id"]
 
-        # Register user2 and share the project so user2 has access
-        await client.post("/api/auth/register", json={
-            "email": "user2@example.com",
-            "password": "testpass123",
-            "full_name": "User Two",
-        })
-        login_resp = await client.post("/api/auth/login", json={
-            "email": "user2@example.com",
-            "password": "testpass123",
-        })
-        token2 = login_resp.json()["access_token"]
-        headers2 = {"Authorization": f"Bearer {token2}"}
+        # Create user2 and share the project so user2 has access
+        headers2 = (await user_factory("user2@example.com", full_name="User Two"))["headers"]
 
         # Share the project with user2 as editor so they have access
         await auth_client.post(
-            f"/api/projects/{pid}/share",
+            f"/api/projects/{project_id}/share",
             json={"email": "user2@example.com", "role": "editor"},
         )
 
         # User2 tries to update user1's comment -> 403
         resp = await client.put(
-            f"/api/projects/{pid}/comments/{comment_id}",
+            f"/api/projects/{project_id}/comments/{comment_id}",
             json={"content": "Hijacked!"},
             headers=headers2,
         )
         assert resp.status_code == 403
 
     @pytest.mark.asyncio
-    async def test_delete_comment(self, auth_client):
-        resp = await auth_client.post("/api/projects/", params={"name": "DeleteComment"})
-        pid = resp.json()["project_id"]
-
+    async def test_delete_comment(self, auth_client, project_id):
         create_resp = await auth_client.post(
-            f"/api/projects/{pid}/comments",
+            f"/api/projects/{project_id}/comments",
             json={"content": "To be deleted"},
         )
         comment_id = create_resp.json()["id"]
 
-        resp = await auth_client.delete(f"/api/projects/{pid}/comments/{comment_id}")
+        resp = await auth_client.delete(f"/api/projects/{project_id}/comments/{comment_id}")
         assert resp.status_code == 200
 
         # Verify deleted
-        resp = await auth_client.get(f"/api/projects/{pid}/comments")
+        resp = await auth_client.get(f"/api/projects/{project_id}/comments")
         assert resp.json() == []
 
 
@@ -3595,11 +3359,8 @@ class TestExternalNetworks:
     """Tests for user-uploaded external network endpoints."""
 
     @pytest.mark.asyncio
-    async def test_upload_and_list_external_network(self, auth_client):
+    async def test_upload_and_list_external_network(self, auth_client, project_id):
         """Upload a network JSON, then list it."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "net_proj"})
-        pid = proj_resp.json()["project_id"]
-
         net_json = json.dumps({
             "metadata": {"name": "My Network"},
             "nodes": [{"id": "a"}, {"id": "b"}, {"id": "c"}],
@@ -3607,7 +3368,7 @@ class TestExternalNetworks:
         })
 
         resp = await auth_client.post(
-            f"/api/data-explore/{pid}/external-networks",
+            f"/api/data-explore/{project_id}/external-networks",
             files={"file": ("test_net.json", net_json, "application/json")},
         )
         assert resp.status_code == 200
@@ -3618,7 +3379,7 @@ class TestExternalNetworks:
         net_id = data["id"]
 
         # List
-        resp = await auth_client.get(f"/api/data-explore/{pid}/external-networks")
+        resp = await auth_client.get(f"/api/data-explore/{project_id}/external-networks")
         assert resp.status_code == 200
         nets = resp.json()
         assert len(nets) == 1
@@ -3626,99 +3387,78 @@ class TestExternalNetworks:
         assert nets[0]["name"] == "My Network"
 
     @pytest.mark.asyncio
-    async def test_get_external_network(self, auth_client):
+    async def test_get_external_network(self, auth_client, project_id):
         """Retrieve uploaded network by ID."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "net_proj2"})
-        pid = proj_resp.json()["project_id"]
-
         net_json = json.dumps({
             "nodes": [{"id": "x"}],
             "edges": [],
         })
         upload = await auth_client.post(
-            f"/api/data-explore/{pid}/external-networks",
+            f"/api/data-explore/{project_id}/external-networks",
             files={"file": ("net.json", net_json, "application/json")},
         )
         net_id = upload.json()["id"]
 
-        resp = await auth_client.get(f"/api/data-explore/{pid}/external-networks/{net_id}")
+        resp = await auth_client.get(f"/api/data-explore/{project_id}/external-networks/{net_id}")
         assert resp.status_code == 200
         data = resp.json()
         assert len(data["nodes"]) == 1
         assert data["nodes"][0]["id"] == "x"
 
     @pytest.mark.asyncio
-    async def test_delete_external_network(self, auth_client):
+    async def test_delete_external_network(self, auth_client, project_id):
         """Delete an uploaded network."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "net_proj3"})
-        pid = proj_resp.json()["project_id"]
-
         net_json = json.dumps({"nodes": [{"id": "z"}], "edges": []})
         upload = await auth_client.post(
-            f"/api/data-explore/{pid}/external-networks",
+            f"/api/data-explore/{project_id}/external-networks",
             files={"file": ("net.json", net_json, "application/json")},
         )
         net_id = upload.json()["id"]
 
-        resp = await auth_client.delete(f"/api/data-explore/{pid}/external-networks/{net_id}")
+        resp = await auth_client.delete(f"/api/data-explore/{project_id}/external-networks/{net_id}")
         assert resp.status_code == 200
         assert resp.json()["deleted"] is True
 
         # Verify gone
-        resp = await auth_client.get(f"/api/data-explore/{pid}/external-networks/{net_id}")
+        resp = await auth_client.get(f"/api/data-explore/{project_id}/external-networks/{net_id}")
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_upload_invalid_json(self, auth_client):
+    async def test_upload_invalid_json(self, auth_client, project_id):
         """Uploading non-JSON returns 400."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "net_proj4"})
-        pid = proj_resp.json()["project_id"]
-
         resp = await auth_client.post(
-            f"/api/data-explore/{pid}/external-networks",
+            f"/api/data-explore/{project_id}/external-networks",
             files={"file": ("bad.json", "not json{{{", "application/json")},
         )
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_upload_missing_nodes(self, auth_client):
+    async def test_upload_missing_nodes(self, auth_client, project_id):
         """Uploading JSON without nodes array returns 400."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "net_proj5"})
-        pid = proj_resp.json()["project_id"]
-
         resp = await auth_client.post(
-            f"/api/data-explore/{pid}/external-networks",
+            f"/api/data-explore/{project_id}/external-networks",
             files={"file": ("bad.json", json.dumps({"edges": []}), "application/json")},
         )
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_upload_missing_edges(self, auth_client):
+    async def test_upload_missing_edges(self, auth_client, project_id):
         """Uploading JSON without edges array returns 400."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "net_proj6"})
-        pid = proj_resp.json()["project_id"]
-
         resp = await auth_client.post(
-            f"/api/data-explore/{pid}/external-networks",
+            f"/api/data-explore/{project_id}/external-networks",
             files={"file": ("bad.json", json.dumps({"nodes": []}), "application/json")},
         )
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_list_empty_project(self, auth_client):
+    async def test_list_empty_project(self, auth_client, project_id):
         """Listing networks for a project with none returns empty list."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "net_empty"})
-        pid = proj_resp.json()["project_id"]
-
-        resp = await auth_client.get(f"/api/data-explore/{pid}/external-networks")
+        resp = await auth_client.get(f"/api/data-explore/{project_id}/external-networks")
         assert resp.status_code == 200
         assert resp.json() == []
 
     @pytest.mark.asyncio
-    async def test_delete_nonexistent(self, auth_client):
+    async def test_delete_nonexistent(self, auth_client, project_id):
         """Deleting a network that doesn't exist returns 404."""
-        proj_resp = await auth_client.post("/api/projects/", params={"name": "net_proj7"})
-        pid = proj_resp.json()["project_id"]
-
-        resp = await auth_client.delete(f"/api/data-explore/{pid}/external-networks/nonexistent_id")
+        resp = await auth_client.delete(f"/api/data-explore/{project_id}/external-networks/nonexistent_id")
         assert resp.status_code == 404